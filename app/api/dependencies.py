@@ -1,26 +1,91 @@
 from typing import Optional
+from dataclasses import dataclass
+import time
 from fastapi import Depends, HTTPException, status
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select
+from sqlalchemy import select, exists, bindparam
 from jose import JWTError, jwt
+from cachetools import TTLCache
 import structlog
 
 from app.core.config import settings
 from app.core.database import get_db
-from app.db.models import User
+from app.db.models import User, Portfolio
 
 
 security = HTTPBearer()
 logger = structlog.get_logger("dependencies")
 
+# Built once rather than per request; access tokens always carry sub and exp
+_JWT_ALGORITHMS = [settings.ALGORITHM]
+_JWT_OPTIONS = {"require_sub": True, "require_exp": True}
+
+
+@dataclass(frozen=True)
+class CurrentUser:
+    """Immutable snapshot of the authenticated user
+
+    Cached across requests, so it must not be an ORM instance: a session-bound
+    User expires on rollback and is detached once its session closes.
+    """
+    id: str
+    email: str
+    is_active: bool
+
+
+@dataclass(frozen=True)
+class CachedAuth:
+    """Verified token entry: the resolved user and the token's expiry (epoch seconds)"""
+    user: CurrentUser
+    exp: float
+
+
+# Verified tokens keyed by the raw bearer string, so repeat requests skip
+# jwt.decode and the user lookup until the token expires or is evicted
+_TOKEN_CACHE: TTLCache = TTLCache(
+    maxsize=settings.TOKEN_CACHE_MAX_SIZE,
+    ttl=settings.TOKEN_CACHE_TTL_SECONDS,
+)
+
+
+# Built once so every lookup hits the same compiled/prepared statement
+USER_BY_EMAIL = select(User).where(User.email == bindparam("email"))
+_CURRENT_USER_BY_EMAIL = select(User.id, User.email, User.is_active).where(User.email == bindparam("email"))
+
+# Users keyed by email, so a fresh token for a known user still skips the lookup
+_USER_CACHE: TTLCache = TTLCache(
+    maxsize=settings.USER_CACHE_MAX_SIZE,
+    ttl=settings.USER_CACHE_TTL_SECONDS,
+)
+
+
+def invalidate_token(token: str) -> None:
+    """Drop a token from the verification cache (e.g. on logout)"""
+    cached = _TOKEN_CACHE.pop(token, None)
+    if cached is not None:
+        invalidate_user(cached.user.email)
+
+
+def invalidate_user(email: str) -> None:
+    """Drop a user from the lookup cache after it has been modified"""
+    _USER_CACHE.pop(email, None)
+
 
 async def get_current_user(
     credentials: HTTPAuthorizationCredentials = Depends(security),
     db: AsyncSession = Depends(get_db)
-) -> User:
+) -> CurrentUser:
     """Get current authenticated user from JWT token"""
     
+    token = credentials.credentials
+    
+    cached = _TOKEN_CACHE.get(token)
+    if cached is not None:
+        if cached.exp > time.time():
+            return cached.user
+        invalidate_token(token)
+    
     credentials_exception = HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
         detail="Could not validate credentials",
@@ -28,21 +93,56 @@ async def get_current_user(
     )
     
     try:
-        logger.info(f"Attempting to decode JWT token: {credentials.credentials[:50]}...")
-        payload = jwt.decode(credentials.credentials, settings.SECRET_KEY, algorithms=[settings.ALGORITHM])
+        logger.debug("decoding_jwt")
+        payload = jwt.decode(token, settings.SECRET_KEY, algorithms=_JWT_ALGORITHMS, options=_JWT_OPTIONS)
         email: Optional[str] = payload.get("sub")
-        logger.info(f"JWT payload decoded successfully, email: {email}")
+        logger.debug("jwt_decoded", email=email)
         if email is None:
             logger.error("No email found in JWT payload")
             raise credentials_exception
     except JWTError as e:
-        logger.error(f"JWT decoding failed: {str(e)}")
+        logger.error("JWT decoding failed", error=str(e))
         raise credentials_exception
     
-    result = await db.execute(select(User).where(User.email == email))
-    user = result.scalar_one_or_none()
-    
+    user = _USER_CACHE.get(email)
     if user is None:
-        raise credentials_exception
+        result = await db.execute(_CURRENT_USER_BY_EMAIL, {"email": email})
+        row = result.one_or_none()
+        
+        if row is None:
+            raise credentials_exception
+        
+        user = CurrentUser(id=row.id, email=row.email, is_active=row.is_active)
+        _USER_CACHE[email] = user
+    
+    _TOKEN_CACHE[token] = CachedAuth(user=user, exp=float(payload["exp"]))
+    
+    return user
+
+
+async def portfolio_is_owned(db: AsyncSession, portfolio_id: str, user_id: str) -> bool:
+    """Indexed existence probe instead of loading the portfolio row"""
+    return await db.scalar(
+        select(
+            exists().where(
+                Portfolio.id == portfolio_id,
+                Portfolio.user_id == user_id
+            )
+        )
+    )
+
+
+async def ensure_portfolio_owned(
+    portfolio_id: str,
+    current_user: CurrentUser = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db)
+) -> str:
+    """Verify the requested portfolio belongs to the current user"""
+    
+    if not await portfolio_is_owned(db, portfolio_id, current_user.id):
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Portfolio not found"
+        )
     
-    return user
\ No newline at end of file
+    return portfolio_id
@@ -1,20 +0,0 @@
-from fastapi import APIRouter
-
-from app.api.v1.endpoints import (
-    auth,
-    portfolios,
-    transactions,
-    uploads,
-    dashboard,
-    reports
-)
-
-api_router = APIRouter()
-
-# Include all endpoint routers
-api_router.include_router(auth.router, prefix="/auth", tags=["Authentication"])
-api_router.include_router(portfolios.router, prefix="/portfolios", tags=["Portfolios"])
-api_router.include_router(transactions.router, prefix="/transactions", tags=["Transactions"])
-api_router.include_router(uploads.router, prefix="/uploads", tags=["File Uploads"])
-api_router.include_router(dashboard.router, prefix="/dashboard", tags=["Dashboard"])
-api_router.include_router(reports.router, prefix="/reports", tags=["Reports"])
\ No newline at end of file
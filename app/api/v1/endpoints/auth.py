@@ -1,22 +1,30 @@
 from fastapi import APIRouter, HTTPException, status, Depends
+from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select
+from sqlalchemy.exc import SQLAlchemyError
 from pydantic import BaseModel, EmailStr
-# Removed passlib import for MVP testing
 from datetime import datetime, timedelta
+from typing import Optional
 from jose import JWTError, jwt
+from argon2 import PasswordHasher
+from argon2.exceptions import VerificationError, InvalidHashError
+import anyio
+import hashlib
+import hmac
 import structlog
 
 from app.core.database import get_db
 from app.core.config import settings
+from app.api.dependencies import USER_BY_EMAIL, invalidate_token, invalidate_user
 from app.db.models import User
 
 
 router = APIRouter()
 logger = structlog.get_logger("auth_api")
+optional_security = HTTPBearer(auto_error=False)
 
-# Simple password hashing for MVP testing (use proper hashing in production)
-import hashlib
+# Argon2id, tuned to a few hundred ms per hash; hashing and verification run in worker threads
+password_hasher = PasswordHasher(time_cost=3, memory_cost=64 * 1024, parallelism=2)
 
 
 class UserRegister(BaseModel):
@@ -43,12 +51,28 @@ class UserResponse(BaseModel):
     created_at: datetime
 
 
+def _is_legacy_hash(hashed_password: str) -> bool:
+    """Hashes created before Argon2 are bare SHA-256 hex digests"""
+    return not hashed_password.startswith("$argon2")
+
+
 def verify_password(plain_password, hashed_password):
-    return hashlib.sha256(plain_password.encode()).hexdigest() == hashed_password
+    if _is_legacy_hash(hashed_password):
+        legacy_hash = hashlib.sha256(plain_password.encode()).hexdigest()
+        return hmac.compare_digest(legacy_hash, hashed_password)
+    
+    try:
+        return password_hasher.verify(hashed_password, plain_password)
+    except (VerificationError, InvalidHashError):
+        return False
+
+
+def password_needs_rehash(hashed_password):
+    return _is_legacy_hash(hashed_password) or password_hasher.check_needs_rehash(hashed_password)
 
 
 def get_password_hash(password):
-    return hashlib.sha256(password.encode()).hexdigest()
+    return password_hasher.hash(password)
 
 
 def create_access_token(data: dict, expires_delta: timedelta = None):
@@ -68,7 +92,7 @@ async def register(user_data: UserRegister, db: AsyncSession = Depends(get_db)):
     
     try:
         # Check if user already exists
-        result = await db.execute(select(User).where(User.email == user_data.email))
+        result = await db.execute(USER_BY_EMAIL, {"email": user_data.email})
         existing_user = result.scalar_one_or_none()
         
         if existing_user:
@@ -78,7 +102,7 @@ async def register(user_data: UserRegister, db: AsyncSession = Depends(get_db)):
             )
         
         # Create new user
-        hashed_password = get_password_hash(user_data.password)
+        hashed_password = await anyio.to_thread.run_sync(get_password_hash, user_data.password)
         new_user = User(
             email=user_data.email,
             hashed_password=hashed_password,
@@ -100,10 +124,7 @@ async def register(user_data: UserRegister, db: AsyncSession = Depends(get_db)):
             created_at=new_user.created_at
         )
         
-    except HTTPException:
-        await db.rollback()
-        raise
-    except Exception as e:
+    except SQLAlchemyError as e:
         await db.rollback()
         logger.error("Registration failed", error=str(e))
         raise HTTPException(
@@ -118,10 +139,14 @@ async def login(user_credentials: UserLogin, db: AsyncSession = Depends(get_db))
     
     try:
         # Find user by email
-        result = await db.execute(select(User).where(User.email == user_credentials.email))
+        result = await db.execute(USER_BY_EMAIL, {"email": user_credentials.email})
         user = result.scalar_one_or_none()
         
-        if not user or not verify_password(user_credentials.password, user.hashed_password):
+        password_valid = user is not None and await anyio.to_thread.run_sync(
+            verify_password, user_credentials.password, user.hashed_password
+        )
+        
+        if not password_valid:
             raise HTTPException(
                 status_code=status.HTTP_401_UNAUTHORIZED,
                 detail="Incorrect email or password",
@@ -134,6 +159,14 @@ async def login(user_credentials: UserLogin, db: AsyncSession = Depends(get_db))
                 detail="Inactive user"
             )
         
+        # Transparently upgrade legacy SHA-256 (or outdated Argon2) hashes
+        if password_needs_rehash(user.hashed_password):
+            user.hashed_password = await anyio.to_thread.run_sync(
+                get_password_hash, user_credentials.password
+            )
+            await db.commit()
+            invalidate_user(user.email)
+        
         # Create access token
         access_token_expires = timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES)
         access_token = create_access_token(
@@ -144,9 +177,8 @@ async def login(user_credentials: UserLogin, db: AsyncSession = Depends(get_db))
         
         return {"access_token": access_token, "token_type": "bearer"}
         
-    except HTTPException:
-        raise
-    except Exception as e:
+    except SQLAlchemyError as e:
+        await db.rollback()
         logger.error("Login failed", error=str(e))
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
@@ -155,8 +187,11 @@ async def login(user_credentials: UserLogin, db: AsyncSession = Depends(get_db))
 
 
 @router.post("/logout")
-async def logout():
+async def logout(
+    credentials: Optional[HTTPAuthorizationCredentials] = Depends(optional_security)
+):
     """User logout endpoint"""
-    # In a real implementation, you'd invalidate the token
-    # For MVP, just return success
+    # Tokens are stateless; for MVP we only evict it from the verification cache
+    if credentials:
+        invalidate_token(credentials.credentials)
     return {"message": "Successfully logged out"}
\ No newline at end of file
@@ -1,14 +1,16 @@
-from fastapi import APIRouter, Depends, HTTPException, status, BackgroundTasks
+from fastapi import APIRouter, Depends, HTTPException, status, BackgroundTasks, Response, Query
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, and_, or_
-from sqlalchemy.orm import selectinload
-from typing import List
+from sqlalchemy import select, and_, or_, bindparam
+from sqlalchemy.exc import SQLAlchemyError
+from typing import List, Set
+from pydantic import TypeAdapter
 import structlog
 from datetime import datetime, timedelta
 
-from app.core.database import get_db
-from app.api.dependencies import get_current_user
-from app.db.models import User, CorporateAction, Position, TaxLot, Transaction, Instrument
+from app.core.database import get_db, AsyncSessionLocal
+from app.core.cache import response_cache
+from app.api.dependencies import CurrentUser, get_current_user
+from app.db.models import CorporateAction, Position, TaxLot, Transaction, Instrument
 from app.api.v1.schemas.corporate_actions import (
     CorporateActionCreate,
     CorporateActionResponse,
@@ -20,32 +22,71 @@ from app.portfolio.corporate_actions import CorporateActionProcessor
 
 router = APIRouter()
 logger = structlog.get_logger("corporate_actions_api")
+corporate_action_list_adapter = TypeAdapter(List[CorporateActionResponse])
+
+# DB enums map onto the schema enums by value; plain dict lookups avoid an
+# Enum.__call__ per row (both enums subclass str, so DB members hash as values)
+_ACTION_TYPES = {member.value: member for member in CorporateActionType}
+_ACTION_STATUSES = {member.value: member for member in CorporateActionStatus}
+
+# Select only the response columns so rows map straight onto the schema; built
+# once so the base statement compiles (and prepares) once per connection
+_LIST_QUERY = (
+    select(
+        CorporateAction.id,
+        CorporateAction.instrument_id,
+        CorporateAction.action_type,
+        CorporateAction.status,
+        CorporateAction.ex_date,
+        CorporateAction.record_date,
+        CorporateAction.payment_date,
+        CorporateAction.ratio_old,
+        CorporateAction.ratio_new,
+        CorporateAction.cash_amount,
+        CorporateAction.description,
+        CorporateAction.created_at,
+        CorporateAction.updated_at
+    )
+    .where(
+        or_(
+            CorporateAction.created_by == bindparam("user_id"),
+            CorporateAction.status == CorporateActionStatus.APPROVED
+        )
+    )
+)
+
+# Instrument names are opt-in (?include=instrument) to skip the join by default
+_LIST_QUERY_WITH_INSTRUMENT = (
+    _LIST_QUERY
+    .add_columns(Instrument.name.label("instrument_name"))
+    .join(Instrument, CorporateAction.instrument_id == Instrument.id)
+)
 
 
 @router.get("/", response_model=List[CorporateActionResponse])
 async def list_corporate_actions(
     instrument_id: str = None,
     action_type: CorporateActionType = None,
-    status: CorporateActionStatus = None,
+    action_status: CorporateActionStatus = Query(None, alias="status"),
     skip: int = 0,
     limit: int = 100,
-    current_user: User = Depends(get_current_user),
+    include: Set[str] = Query(set()),
+    current_user: CurrentUser = Depends(get_current_user),
     db: AsyncSession = Depends(get_db)
 ):
     """List corporate actions"""
     
+    include_instrument = "instrument" in include
+    cache_key = response_cache.key(
+        "corporate-actions", current_user.id, instrument_id, action_type, action_status, skip, limit,
+        include_instrument
+    )
+    cached = await response_cache.get(cache_key)
+    if cached is not None:
+        return Response(content=cached, media_type="application/json")
+    
     try:
-        query = (
-            select(CorporateAction)
-            .options(selectinload(CorporateAction.instrument))
-            .join(Instrument)
-            .where(
-                or_(
-                    CorporateAction.created_by == current_user.id,
-                    CorporateAction.status == CorporateActionStatus.APPROVED
-                )
-            )
-        )
+        query = _LIST_QUERY_WITH_INSTRUMENT if include_instrument else _LIST_QUERY
         
         if instrument_id:
             query = query.where(CorporateAction.instrument_id == instrument_id)
@@ -53,35 +94,30 @@ async def list_corporate_actions(
         if action_type:
             query = query.where(CorporateAction.action_type == action_type)
         
-        if status:
-            query = query.where(CorporateAction.status == status)
+        if action_status:
+            query = query.where(CorporateAction.status == action_status)
         
         query = query.order_by(CorporateAction.ex_date.desc()).offset(skip).limit(limit)
         
-        result = await db.execute(query)
-        actions = result.scalars().all()
-        
-        return [
-            CorporateActionResponse(
-                id=action.id,
-                instrument_id=action.instrument_id,
-                instrument_name=action.instrument.name,
-                action_type=action.action_type,
-                status=action.status,
-                ex_date=action.ex_date,
-                record_date=action.record_date,
-                payment_date=action.payment_date,
-                ratio_old=action.ratio_old,
-                ratio_new=action.ratio_new,
-                cash_amount=action.cash_amount,
-                description=action.description,
-                created_at=action.created_at,
-                updated_at=action.updated_at
-            )
-            for action in actions
+        result = await db.execute(query, {"user_id": current_user.id})
+        
+        # Rows come straight from typed columns, so skip re-validation and
+        # only map the DB enums onto the schema enums
+        response = [
+            CorporateActionResponse.model_construct(**{
+                **row,
+                "action_type": _ACTION_TYPES[row["action_type"]],
+                "status": _ACTION_STATUSES[row["status"]]
+            })
+            for row in result.mappings()
         ]
         
-    except Exception as e:
+        # Serialize once for both the cache and the response body
+        body = corporate_action_list_adapter.dump_json(response)
+        await response_cache.set(cache_key, body)
+        return Response(content=body, media_type="application/json")
+        
+    except SQLAlchemyError as e:
         logger.error("Error listing corporate actions", user_id=current_user.id, error=str(e))
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
@@ -93,7 +129,7 @@ async def list_corporate_actions(
 async def create_corporate_action(
     action_data: CorporateActionCreate,
     background_tasks: BackgroundTasks,
-    current_user: User = Depends(get_current_user),
+    current_user: CurrentUser = Depends(get_current_user),
     db: AsyncSession = Depends(get_db)
 ):
     """Create new corporate action"""
@@ -125,6 +161,7 @@ async def create_corporate_action(
         db.add(corporate_action)
         await db.commit()
         await db.refresh(corporate_action)
+        await response_cache.invalidate("corporate-actions")
         
         # Process corporate action in background if auto-approved
         if corporate_action.status == CorporateActionStatus.APPROVED:
@@ -141,12 +178,12 @@ async def create_corporate_action(
             action_type=action_data.action_type
         )
         
-        return CorporateActionResponse(
+        return CorporateActionResponse.model_construct(
             id=corporate_action.id,
             instrument_id=corporate_action.instrument_id,
             instrument_name=instrument.name,
-            action_type=corporate_action.action_type,
-            status=corporate_action.status,
+            action_type=action_data.action_type,
+            status=_ACTION_STATUSES[corporate_action.status],
             ex_date=corporate_action.ex_date,
             record_date=corporate_action.record_date,
             payment_date=corporate_action.payment_date,
@@ -158,7 +195,7 @@ async def create_corporate_action(
             updated_at=corporate_action.updated_at
         )
         
-    except Exception as e:
+    except SQLAlchemyError as e:
         await db.rollback()
         logger.error("Error creating corporate action", user_id=current_user.id, error=str(e))
         raise HTTPException(
@@ -171,7 +208,7 @@ async def create_corporate_action(
 async def process_corporate_action(
     action_id: str,
     background_tasks: BackgroundTasks,
-    current_user: User = Depends(get_current_user),
+    current_user: CurrentUser = Depends(get_current_user),
     db: AsyncSession = Depends(get_db)
 ):
     """Process/apply corporate action to positions"""
@@ -194,6 +231,7 @@ async def process_corporate_action(
         # Update status to processing
         corporate_action.status = CorporateActionStatus.PROCESSING
         await db.commit()
+        await response_cache.invalidate("corporate-actions")
         
         # Process in background
         background_tasks.add_task(
@@ -206,7 +244,8 @@ async def process_corporate_action(
         
         return {"message": "Corporate action processing started", "action_id": action_id}
         
-    except Exception as e:
+    except SQLAlchemyError as e:
+        await db.rollback()
         logger.error("Error processing corporate action", action_id=action_id, error=str(e))
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
@@ -217,20 +256,24 @@ async def process_corporate_action(
 async def process_corporate_action_async(action_id: str, user_id: str):
     """Background task to process corporate action"""
     
-    from app.core.database import async_session
-    
-    async with async_session() as db:
-        try:
+    try:
+        # One session and one transaction for the whole action
+        async with AsyncSessionLocal() as db, db.begin():
             processor = CorporateActionProcessor(db)
             await processor.process_action(action_id)
-            
-            logger.info("Completed corporate action processing", action_id=action_id, user_id=user_id)
-            
-        except Exception as e:
-            logger.error("Error in corporate action processing", action_id=action_id, error=str(e))
-            
-            # Update status to failed
+        
+        logger.info("Completed corporate action processing", action_id=action_id, user_id=user_id)
+        
+    except Exception as e:
+        logger.error("Error in corporate action processing", action_id=action_id, error=str(e))
+        
+        # The failed transaction was rolled back; record the failure separately
+        async with AsyncSessionLocal() as db, db.begin():
             corporate_action = await db.get(CorporateAction, action_id)
             if corporate_action:
                 corporate_action.status = CorporateActionStatus.FAILED
-                await db.commit()
\ No newline at end of file
+    
+    # Processing touches positions and transactions across users
+    await response_cache.invalidate("corporate-actions")
+    await response_cache.invalidate("dashboard")
+    await response_cache.invalidate("portfolios")
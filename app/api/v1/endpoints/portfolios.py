@@ -1,12 +1,14 @@
 from typing import List, Optional, Dict, Any
 from datetime import datetime
 from decimal import Decimal
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, status, Response
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import text
+from sqlalchemy import select
+from pydantic import TypeAdapter
 import structlog
 
 from app.core.database import get_db
+from app.core.cache import response_cache
 from app.portfolio.service import portfolio_service
 from app.api.v1.schemas.portfolio import (
     PortfolioResponse,
@@ -15,33 +17,44 @@ from app.api.v1.schemas.portfolio import (
     PerformanceResponse
 )
 from app.api.v1.schemas.common import PaginatedResponse
-from app.api.dependencies import get_current_user
-from app.db.models import User, Portfolio
+from app.api.dependencies import CurrentUser, get_current_user, ensure_portfolio_owned
+from app.db.models import Portfolio
 
 
 router = APIRouter()
 logger = structlog.get_logger("portfolio_api")
+position_list_adapter = TypeAdapter(List[PositionResponse])
 
 
 @router.get("/", response_model=List[PortfolioResponse])
 async def get_user_portfolios(
-    current_user: User = Depends(get_current_user),
+    current_user: CurrentUser = Depends(get_current_user),
     db: AsyncSession = Depends(get_db)
 ) -> List[PortfolioResponse]:
     """Get all portfolios for the current user"""
     
     try:
-        portfolios = await db.execute(
-            text("SELECT * FROM portfolios WHERE user_id = :user_id ORDER BY created_at"),
-            {"user_id": current_user.id}
+        result = await db.execute(
+            select(
+                Portfolio.id,
+                Portfolio.name,
+                Portfolio.description,
+                Portfolio.base_currency,
+                Portfolio.is_default
+            )
+            .where(Portfolio.user_id == current_user.id)
+            .order_by(Portfolio.created_at)
+        )
+        rows = result.all()
+        
+        # Summaries for every portfolio come from one batched computation
+        summaries = await portfolio_service.get_portfolio_summaries_bulk(
+            db, [portfolio.id for portfolio in rows]
         )
         
         portfolio_list = []
-        for portfolio in portfolios.fetchall():
-            # Get basic summary for each portfolio
-            summary = await portfolio_service.get_portfolio_summary(
-                db, portfolio.id
-            )
+        for portfolio in rows:
+            summary = summaries[portfolio.id]
             
             portfolio_response = PortfolioResponse(
                 id=portfolio.id,
@@ -68,24 +81,21 @@ async def get_user_portfolios(
         )
 
 
-@router.get("/{portfolio_id}", response_model=PortfolioSummaryResponse)
+@router.get("/{portfolio_id}", response_model=PortfolioSummaryResponse, dependencies=[Depends(ensure_portfolio_owned)])
 async def get_portfolio_summary(
     portfolio_id: str,
     valuation_date: Optional[datetime] = None,
-    current_user: User = Depends(get_current_user),
+    current_user: CurrentUser = Depends(get_current_user),
     db: AsyncSession = Depends(get_db)
 ) -> PortfolioSummaryResponse:
     """Get detailed portfolio summary"""
     
+    cache_key = response_cache.key("portfolios", current_user.id, portfolio_id, "summary", valuation_date)
+    cached = await response_cache.get(cache_key)
+    if cached is not None:
+        return Response(content=cached, media_type="application/json")
+    
     try:
-        # Verify portfolio ownership
-        portfolio = await db.get(Portfolio, portfolio_id)
-        if not portfolio or portfolio.user_id != current_user.id:
-            raise HTTPException(
-                status_code=status.HTTP_404_NOT_FOUND,
-                detail="Portfolio not found"
-            )
-        
         # Get comprehensive summary
         summary = await portfolio_service.get_portfolio_summary(
             db, portfolio_id, valuation_date
@@ -94,7 +104,7 @@ async def get_portfolio_summary(
         response = PortfolioSummaryResponse(
             id=portfolio_id,
             name=summary['portfolio_name'],
-            description=portfolio.description,
+            description=summary['description'],
             base_currency=summary['base_currency'],
             valuation_date=summary['valuation_date'],
             
@@ -112,7 +122,7 @@ async def get_portfolio_summary(
             # Holdings
             position_count=summary['total_positions'],
             positions=[
-                PositionResponse(**position) 
+                PositionResponse.model_construct(**position)
                 for position in summary['positions']
             ],
             
@@ -121,8 +131,11 @@ async def get_portfolio_summary(
             currency_allocation=summary['currency_allocation']
         )
         
+        body = response.model_dump_json().encode()
+        await response_cache.set(cache_key, body)
+        
         logger.info("Retrieved portfolio summary", portfolio_id=portfolio_id)
-        return response
+        return Response(content=body, media_type="application/json")
         
     except HTTPException:
         raise
@@ -134,48 +147,31 @@ async def get_portfolio_summary(
         )
 
 
-@router.get("/{portfolio_id}/positions", response_model=List[PositionResponse])
+@router.get("/{portfolio_id}/positions", response_model=List[PositionResponse], dependencies=[Depends(ensure_portfolio_owned)])
 async def get_portfolio_positions(
     portfolio_id: str,
     valuation_date: Optional[datetime] = None,
-    current_user: User = Depends(get_current_user),
+    current_user: CurrentUser = Depends(get_current_user),
     db: AsyncSession = Depends(get_db)
 ) -> List[PositionResponse]:
     """Get all positions for a portfolio"""
     
     try:
-        # Verify portfolio ownership
-        portfolio = await db.get(Portfolio, portfolio_id)
-        if not portfolio or portfolio.user_id != current_user.id:
-            raise HTTPException(
-                status_code=status.HTTP_404_NOT_FOUND,
-                detail="Portfolio not found"
-            )
-        
         # Calculate positions
         positions = await portfolio_service.calculate_portfolio_positions(
             db, portfolio_id, valuation_date
         )
         
-        position_responses = []
-        for position in positions:
-            response = PositionResponse(
-                instrument_id=position.instrument_id,
-                instrument_name=position.instrument_name,
-                quantity=float(position.quantity),
-                average_cost=float(position.average_cost),
-                total_cost=float(position.total_cost),
-                current_price=float(position.current_price) if position.current_price else None,
-                market_value=float(position.market_value) if position.market_value else None,
-                unrealized_pnl=float(position.unrealized_pnl) if position.unrealized_pnl else None,
-                unrealized_pnl_percentage=float(position.unrealized_pnl / position.total_cost * 100) if position.unrealized_pnl and position.total_cost > 0 else 0.0,
-                currency=position.currency.value,
-                tax_lots_count=len(position.tax_lots) if position.tax_lots else 0
-            )
-            position_responses.append(response)
+        position_responses = [
+            PositionResponse.model_construct(**portfolio_service.position_to_dict(position))
+            for position in positions
+        ]
         
         logger.info("Retrieved portfolio positions", portfolio_id=portfolio_id, count=len(position_responses))
-        return position_responses
+        return Response(
+            content=position_list_adapter.dump_json(position_responses),
+            media_type="application/json"
+        )
         
     except HTTPException:
         raise
@@ -187,25 +183,24 @@ async def get_portfolio_positions(
         )
 
 
-@router.get("/{portfolio_id}/performance", response_model=PerformanceResponse)
+@router.get("/{portfolio_id}/performance", response_model=PerformanceResponse, dependencies=[Depends(ensure_portfolio_owned)])
 async def get_portfolio_performance(
     portfolio_id: str,
     start_date: Optional[datetime] = None,
     end_date: Optional[datetime] = None,
-    current_user: User = Depends(get_current_user),
+    current_user: CurrentUser = Depends(get_current_user),
     db: AsyncSession = Depends(get_db)
 ) -> PerformanceResponse:
     """Get portfolio performance metrics"""
     
+    cache_key = response_cache.key(
+        "portfolios", current_user.id, portfolio_id, "performance", start_date, end_date
+    )
+    cached = await response_cache.get(cache_key)
+    if cached is not None:
+        return Response(content=cached, media_type="application/json")
+    
     try:
-        # Verify portfolio ownership
-        portfolio = await db.get(Portfolio, portfolio_id)
-        if not portfolio or portfolio.user_id != current_user.id:
-            raise HTTPException(
-                status_code=status.HTTP_404_NOT_FOUND,
-                detail="Portfolio not found"
-            )
-        
         # Calculate performance metrics
         performance = await portfolio_service.calculate_portfolio_performance(
             db, portfolio_id, start_date, end_date
@@ -238,8 +233,11 @@ async def get_portfolio_performance(
             max_drawdown=float(performance.max_drawdown) if performance.max_drawdown else None
         )
         
+        body = response.model_dump_json().encode()
+        await response_cache.set(cache_key, body)
+        
         logger.info("Retrieved portfolio performance", portfolio_id=portfolio_id)
-        return response
+        return Response(content=body, media_type="application/json")
         
     except HTTPException:
         raise
@@ -251,28 +249,22 @@ async def get_portfolio_performance(
         )
 
 
-@router.post("/{portfolio_id}/refresh")
+@router.post("/{portfolio_id}/refresh", dependencies=[Depends(ensure_portfolio_owned)])
 async def refresh_portfolio_positions(
     portfolio_id: str,
-    current_user: User = Depends(get_current_user),
+    current_user: CurrentUser = Depends(get_current_user),
     db: AsyncSession = Depends(get_db)
 ) -> Dict[str, Any]:
     """Refresh portfolio position calculations"""
     
     try:
-        # Verify portfolio ownership
-        portfolio = await db.get(Portfolio, portfolio_id)
-        if not portfolio or portfolio.user_id != current_user.id:
-            raise HTTPException(
-                status_code=status.HTTP_404_NOT_FOUND,
-                detail="Portfolio not found"
-            )
-        
         # Refresh positions
         updated_count = await portfolio_service.update_portfolio_positions(
             db, portfolio_id, force_refresh=True
         )
         
+        await response_cache.invalidate("portfolios", current_user.id, portfolio_id)
+        
         logger.info("Refreshed portfolio positions", portfolio_id=portfolio_id, updated_count=updated_count)
         
         return {
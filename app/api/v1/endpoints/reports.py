@@ -1,20 +1,24 @@
-from fastapi import APIRouter, Depends, HTTPException, status, Query
+from fastapi import APIRouter, Depends, HTTPException, status, Query, Response
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select, and_, extract
-from sqlalchemy.orm import selectinload
-from typing import List, Optional
+from sqlalchemy.orm import joinedload
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
 import structlog
-from datetime import datetime, date
+from datetime import datetime, date, timezone
 import csv
 import io
+from dataclasses import dataclass
+from functools import lru_cache
 from decimal import Decimal
 
 from app.core.database import get_db
-from app.api.dependencies import get_current_user
-from app.db.models import User, Transaction, Portfolio, TaxLot
+from app.api.dependencies import CurrentUser, get_current_user
+from app.db.models import Transaction, TransactionType, Portfolio, TaxLot, Instrument
+from app.portfolio.positions import TaxLotManager
 from app.api.v1.schemas.reports import (
     CapitalGainsReportItem,
     CapitalGainsResponse,
+    CapitalGainsSummaryResponse,
     TaxLotDetails
 )
 from fastapi.responses import StreamingResponse
@@ -22,95 +26,191 @@ from fastapi.responses import StreamingResponse
 
 router = APIRouter()
 logger = structlog.get_logger("reports_api")
+tax_lot_manager = TaxLotManager()
+
+
+def _as_utc(dt: datetime) -> datetime:
+    """Treat naive transaction timestamps as UTC"""
+    return dt if dt.tzinfo else dt.replace(tzinfo=timezone.utc)
+
+
+@dataclass(frozen=True)
+class RealizedLot:
+    """One purchase lot (or part of one) closed by a sale"""
+    instrument_name: str
+    isin: Optional[str]
+    quantity: Decimal
+    buy_date: date
+    sell_date: date
+    buy_price: Decimal
+    sell_price: Decimal
+    buy_value: Decimal
+    sell_value: Decimal
+    capital_gain: Decimal
+    holding_period_days: int
+    is_long_term: bool
+    buy_transaction_id: str
+    sell_transaction_id: str
+
+
+@lru_cache(maxsize=32)
+def _parse_financial_year(financial_year: str) -> Tuple[datetime, datetime]:
+    """FY2025-26 -> [2025-04-01, 2026-04-01) as UTC datetimes (Indian FY: April 1 to March 31)"""
+    fy_parts = financial_year.replace("FY", "").split("-")
+    start_year = int(fy_parts[0])
+    end_year = int(fy_parts[1]) + 2000 if int(fy_parts[1]) < 100 else int(fy_parts[1])
+    
+    return datetime(start_year, 4, 1, tzinfo=timezone.utc), datetime(end_year, 4, 1, tzinfo=timezone.utc)
+
+
+async def _fetch_realized_lots(
+    db: AsyncSession,
+    user_id: str,
+    fy_start: datetime,
+    fy_end: datetime,
+    portfolio_id: Optional[str] = None
+) -> List[RealizedLot]:
+    """Lots closed by sales in [fy_start, fy_end), matched FIFO against earlier purchases"""
+    
+    # Matching needs each sale's purchase history, so load every buy and sell
+    # up to the end of the FY in one statement, instrument joined in
+    query = (
+        select(Transaction)
+        .join(Portfolio, Transaction.portfolio_id == Portfolio.id)
+        .options(joinedload(Transaction.instrument).load_only(Instrument.name, Instrument.isin))
+        .where(
+            and_(
+                Portfolio.user_id == user_id,
+                Transaction.transaction_type.in_([TransactionType.BUY, TransactionType.SELL]),
+                Transaction.transaction_date < fy_end
+            )
+        )
+        .order_by(Transaction.transaction_date)
+    )
+    
+    if portfolio_id:
+        query = query.where(Portfolio.id == portfolio_id)
+    
+    # Rows are matched as they arrive, so only open lots and purchase dates
+    # stay in memory rather than the user's whole transaction history
+    transactions = await db.stream_scalars(query.execution_options(yield_per=500))
+    
+    buy_dates: Dict[str, datetime] = {}
+    lots_by_holding: Dict[Tuple[str, str], List[TaxLot]] = {}
+    realized_lots = []
+    
+    async for txn in transactions:
+        holding = (txn.portfolio_id, txn.instrument_id)
+        lots, realized_gains = tax_lot_manager.process_transaction(txn, lots_by_holding.get(holding, []))
+        lots_by_holding[holding] = lots
+        
+        if txn.transaction_type == TransactionType.BUY:
+            buy_dates[txn.id] = _as_utc(txn.transaction_date)
+            continue
+        
+        sell_datetime = _as_utc(txn.transaction_date)
+        if sell_datetime < fy_start:
+            continue
+        
+        # Per-sale values are shared by every lot the sale consumed
+        sell_date = sell_datetime.date()
+        instrument_name = txn.instrument.name
+        isin = txn.instrument.isin
+        
+        for realized_gain in realized_gains:
+            sale_price = realized_gain.sale_price
+            
+            for buy_transaction_id, quantity, buy_value in realized_gain.acquisition_lots:
+                buy_datetime = buy_dates[buy_transaction_id]
+                holding_days = (sell_datetime - buy_datetime).days
+                sell_value = quantity * sale_price
+                
+                realized_lots.append(RealizedLot(
+                    instrument_name=instrument_name,
+                    isin=isin,
+                    quantity=quantity,
+                    buy_date=buy_datetime.date(),
+                    sell_date=sell_date,
+                    buy_price=buy_value / quantity,
+                    sell_price=sale_price,
+                    buy_value=buy_value,
+                    sell_value=sell_value,
+                    capital_gain=sell_value - buy_value,
+                    holding_period_days=holding_days,
+                    is_long_term=holding_days > 365,  # 1 year for equity, can be refined by asset class
+                    buy_transaction_id=buy_transaction_id,
+                    sell_transaction_id=txn.id
+                ))
+    
+    return realized_lots
+
+
+def _sum_gains(realized_lots: List[RealizedLot]) -> Tuple[Decimal, Decimal]:
+    """Short-term and long-term gain totals"""
+    total_short_term_gains = Decimal('0')
+    total_long_term_gains = Decimal('0')
+    
+    for lot in realized_lots:
+        if lot.is_long_term:
+            total_long_term_gains += lot.capital_gain
+        else:
+            total_short_term_gains += lot.capital_gain
+    
+    return total_short_term_gains, total_long_term_gains
+
+
+def _encode_csv(rows: Iterable[list]) -> Iterator[bytes]:
+    """Encode CSV rows one at a time so the file is never held in memory whole"""
+    # The writer encodes straight into the byte buffer; no str copy per row
+    buffer = io.BytesIO()
+    writer = csv.writer(io.TextIOWrapper(buffer, encoding="utf-8", newline="", write_through=True))
+    
+    for row in rows:
+        writer.writerow(row)
+        yield buffer.getvalue()
+        buffer.seek(0)
+        buffer.truncate(0)
 
 
 @router.get("/capital-gains", response_model=CapitalGainsResponse)
 async def get_capital_gains_report(
     financial_year: str = Query(..., description="Format: FY2025-26"),
     portfolio_id: Optional[str] = Query(None),
-    current_user: User = Depends(get_current_user),
+    current_user: CurrentUser = Depends(get_current_user),
     db: AsyncSession = Depends(get_db)
 ):
     """Get capital gains report for specified financial year"""
     
     try:
-        # Parse financial year
-        fy_parts = financial_year.replace("FY", "").split("-")
-        start_year = int(fy_parts[0])
-        end_year = int(fy_parts[1]) + 2000 if int(fy_parts[1]) < 100 else int(fy_parts[1])
-        
-        # Indian FY: April 1 to March 31
-        fy_start = date(start_year, 4, 1)
-        fy_end = date(end_year, 3, 31)
-        
-        # Build query for realized tax lots (sells) in the FY
-        query = (
-            select(TaxLot)
-            .options(
-                selectinload(TaxLot.transaction).selectinload(Transaction.instrument),
-                selectinload(TaxLot.buy_transaction).selectinload(Transaction.instrument)
-            )
-            .join(Transaction, TaxLot.transaction_id == Transaction.id)
-            .join(Portfolio, Transaction.portfolio_id == Portfolio.id)
-            .where(
-                and_(
-                    Portfolio.user_id == current_user.id,
-                    TaxLot.status == "realized",
-                    Transaction.transaction_date >= fy_start,
-                    Transaction.transaction_date <= fy_end,
-                    Transaction.transaction_type == "sell"
-                )
-            )
-        )
-        
-        if portfolio_id:
-            query = query.where(Portfolio.id == portfolio_id)
-        
-        result = await db.execute(query)
-        tax_lots = result.scalars().all()
-        
-        gains_items = []
-        total_short_term_gains = Decimal('0')
-        total_long_term_gains = Decimal('0')
+        fy_start, fy_end = _parse_financial_year(financial_year)
+        realized_lots = await _fetch_realized_lots(db, current_user.id, fy_start, fy_end, portfolio_id)
+        total_short_term_gains, total_long_term_gains = _sum_gains(realized_lots)
         
-        for tax_lot in tax_lots:
-            sell_txn = tax_lot.transaction
-            buy_txn = tax_lot.buy_transaction
-            
-            # Calculate holding period
-            holding_days = (sell_txn.transaction_date - buy_txn.transaction_date).days
-            is_long_term = holding_days > 365  # 1 year for equity, can be refined by asset class
-            
-            # Calculate gains
-            buy_value = tax_lot.quantity * tax_lot.buy_price
-            sell_value = tax_lot.quantity * tax_lot.sell_price
-            capital_gain = sell_value - buy_value
-            
-            if is_long_term:
-                total_long_term_gains += capital_gain
-            else:
-                total_short_term_gains += capital_gain
-            
-            gains_item = CapitalGainsReportItem(
-                instrument_name=sell_txn.instrument.name,
-                isin=sell_txn.instrument.isin,
-                quantity=tax_lot.quantity,
-                buy_date=buy_txn.transaction_date,
-                sell_date=sell_txn.transaction_date,
-                buy_price=tax_lot.buy_price,
-                sell_price=tax_lot.sell_price,
-                buy_value=buy_value,
-                sell_value=sell_value,
-                capital_gain=capital_gain,
-                holding_period_days=holding_days,
-                is_long_term=is_long_term,
-                tax_lot_details=TaxLotDetails(
-                    tax_lot_id=tax_lot.id,
-                    buy_transaction_id=buy_txn.id,
-                    sell_transaction_id=sell_txn.id
+        # Lots are built from typed columns, so skip re-validating every item
+        gains_items = [
+            CapitalGainsReportItem.model_construct(
+                instrument_name=lot.instrument_name,
+                isin=lot.isin,
+                quantity=lot.quantity,
+                buy_date=lot.buy_date,
+                sell_date=lot.sell_date,
+                buy_price=lot.buy_price,
+                sell_price=lot.sell_price,
+                buy_value=lot.buy_value,
+                sell_value=lot.sell_value,
+                capital_gain=lot.capital_gain,
+                holding_period_days=lot.holding_period_days,
+                is_long_term=lot.is_long_term,
+                tax_lot_details=TaxLotDetails.model_construct(
+                    # Realized lots are matched in memory, not persisted, so the
+                    # (purchase, sale) pair is what identifies one
+                    tax_lot_id=f"{lot.buy_transaction_id}:{lot.sell_transaction_id}",
+                    buy_transaction_id=lot.buy_transaction_id,
+                    sell_transaction_id=lot.sell_transaction_id
                 )
             )
-            gains_items.append(gains_item)
+            for lot in realized_lots
+        ]
         
         response = CapitalGainsResponse(
             financial_year=financial_year,
@@ -129,7 +229,8 @@ async def get_capital_gains_report(
             total_transactions=len(gains_items)
         )
         
-        return response
+        # Serialize in pydantic-core; Decimals stay exact strings as with the default encoder
+        return Response(content=response.model_dump_json(), media_type="application/json")
         
     except Exception as e:
         logger.error("Error generating capital gains report", user_id=current_user.id, error=str(e))
@@ -139,70 +240,100 @@ async def get_capital_gains_report(
         )
 
 
+@router.get("/capital-gains/summary", response_model=CapitalGainsSummaryResponse)
+async def get_capital_gains_summary(
+    financial_year: str = Query(..., description="Format: FY2025-26"),
+    portfolio_id: Optional[str] = Query(None),
+    current_user: CurrentUser = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db)
+):
+    """Get capital gains totals for specified financial year"""
+    
+    try:
+        fy_start, fy_end = _parse_financial_year(financial_year)
+        realized_lots = await _fetch_realized_lots(db, current_user.id, fy_start, fy_end, portfolio_id)
+        total_short_term_gains, total_long_term_gains = _sum_gains(realized_lots)
+        
+        # Totals only: no per-lot items are built or serialized
+        response = CapitalGainsSummaryResponse(
+            financial_year=financial_year,
+            report_date=datetime.now().date(),
+            total_transactions=len(realized_lots),
+            total_short_term_gains=total_short_term_gains,
+            total_long_term_gains=total_long_term_gains,
+            net_capital_gains=total_short_term_gains + total_long_term_gains
+        )
+        
+        logger.info(
+            "Generated capital gains summary",
+            user_id=current_user.id,
+            financial_year=financial_year,
+            total_transactions=len(realized_lots)
+        )
+        
+        return response
+        
+    except Exception as e:
+        logger.error("Error generating capital gains summary", user_id=current_user.id, error=str(e))
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Error generating capital gains summary"
+        )
+
+
 @router.get("/capital-gains/export")
 async def export_capital_gains_csv(
     financial_year: str = Query(..., description="Format: FY2025-26"),
     portfolio_id: Optional[str] = Query(None),
-    current_user: User = Depends(get_current_user),
+    current_user: CurrentUser = Depends(get_current_user),
     db: AsyncSession = Depends(get_db)
 ):
     """Export capital gains report as CSV"""
     
     try:
-        # Get the capital gains data
-        report_data = await get_capital_gains_report(
-            financial_year=financial_year,
-            portfolio_id=portfolio_id,
-            current_user=current_user,
-            db=db
-        )
+        fy_start, fy_end = _parse_financial_year(financial_year)
+        realized_lots = await _fetch_realized_lots(db, current_user.id, fy_start, fy_end, portfolio_id)
+        total_short_term_gains, total_long_term_gains = _sum_gains(realized_lots)
+        
+        def csv_rows():
+            yield [
+                "Instrument Name",
+                "ISIN",
+                "Quantity",
+                "Buy Date",
+                "Sell Date",
+                "Buy Price",
+                "Sell Price",
+                "Buy Value",
+                "Sell Value",
+                "Capital Gain/Loss",
+                "Holding Period (Days)",
+                "Gain Type"
+            ]
+            
+            for lot in realized_lots:
+                yield [
+                    lot.instrument_name,
+                    lot.isin or "",
+                    float(lot.quantity),
+                    lot.buy_date.strftime("%Y-%m-%d"),
+                    lot.sell_date.strftime("%Y-%m-%d"),
+                    float(lot.buy_price),
+                    float(lot.sell_price),
+                    float(lot.buy_value),
+                    float(lot.sell_value),
+                    float(lot.capital_gain),
+                    lot.holding_period_days,
+                    "Long Term" if lot.is_long_term else "Short Term"
+                ]
+            
+            # Summary rows
+            yield []
+            yield ["SUMMARY"]
+            yield ["Total Short Term Gains", "", "", "", "", "", "", "", "", float(total_short_term_gains)]
+            yield ["Total Long Term Gains", "", "", "", "", "", "", "", "", float(total_long_term_gains)]
+            yield ["Net Capital Gains", "", "", "", "", "", "", "", "", float(total_short_term_gains + total_long_term_gains)]
         
-        # Create CSV content
-        output = io.StringIO()
-        writer = csv.writer(output)
-        
-        # Write headers
-        writer.writerow([
-            "Instrument Name",
-            "ISIN",
-            "Quantity",
-            "Buy Date",
-            "Sell Date",
-            "Buy Price",
-            "Sell Price",
-            "Buy Value",
-            "Sell Value",
-            "Capital Gain/Loss",
-            "Holding Period (Days)",
-            "Gain Type"
-        ])
-        
-        # Write data rows
-        for item in report_data.gains_items:
-            writer.writerow([
-                item.instrument_name,
-                item.isin or "",
-                float(item.quantity),
-                item.buy_date.strftime("%Y-%m-%d"),
-                item.sell_date.strftime("%Y-%m-%d"),
-                float(item.buy_price),
-                float(item.sell_price),
-                float(item.buy_value),
-                float(item.sell_value),
-                float(item.capital_gain),
-                item.holding_period_days,
-                "Long Term" if item.is_long_term else "Short Term"
-            ])
-        
-        # Add summary rows
-        writer.writerow([])
-        writer.writerow(["SUMMARY"])
-        writer.writerow(["Total Short Term Gains", "", "", "", "", "", "", "", "", float(report_data.total_short_term_gains)])
-        writer.writerow(["Total Long Term Gains", "", "", "", "", "", "", "", "", float(report_data.total_long_term_gains)])
-        writer.writerow(["Net Capital Gains", "", "", "", "", "", "", "", "", float(report_data.net_capital_gains)])
-        
-        # Prepare file for download
-        output.seek(0)
         filename = f"capital_gains_{financial_year}_{datetime.now().strftime('%Y%m%d')}.csv"
         
         logger.info(
@@ -213,8 +344,8 @@ async def export_capital_gains_csv(
         )
         
         return StreamingResponse(
-            io.BytesIO(output.getvalue().encode()),
-            media_type="application/csv",
+            _encode_csv(csv_rows()),
+            media_type="text/csv",
             headers={"Content-Disposition": f"attachment; filename={filename}"}
         )
         
@@ -1,49 +1,77 @@
 from typing import List
+import asyncio
+import anyio
 from fastapi import APIRouter, Depends, HTTPException, status, UploadFile, File
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select
 import structlog
 
+from app.core.config import settings
 from app.core.database import get_db
-from app.api.dependencies import get_current_user
+from app.core.cache import response_cache
+from app.api.dependencies import CurrentUser, get_current_user, portfolio_is_owned
 from app.ingestion.service import ingestion_service
-from app.db.models import User, Portfolio
 
 
 router = APIRouter()
 logger = structlog.get_logger("uploads_api")
 
+_READ_CHUNK_SIZE = 64 * 1024
+
+
+async def _read_upload(file: UploadFile) -> bytes:
+    """Read an upload in chunks, rejecting it as soon as it passes the size limit"""
+    limit = settings.MAX_FILE_SIZE_MB * 1024 * 1024
+    
+    content = bytearray()
+    if file.size is None or file.size <= limit:
+        while chunk := await file.read(_READ_CHUNK_SIZE):
+            content += chunk
+            if len(content) > limit:
+                break
+        else:
+            return bytes(content)
+    
+    # Literal status: the constant's name differs across supported Starlette versions
+    raise HTTPException(
+        status_code=413,
+        detail=f"{file.filename} exceeds the {settings.MAX_FILE_SIZE_MB} MB upload limit"
+    )
+
 
 @router.post("/")
 async def upload_file(
     portfolio_id: str,
     files: List[UploadFile] = File(...),
-    current_user: User = Depends(get_current_user),
+    current_user: CurrentUser = Depends(get_current_user),
     db: AsyncSession = Depends(get_db)
 ):
     """Upload financial statement files"""
     
     try:
         # Validate portfolio exists and belongs to current user
-        portfolio_stmt = select(Portfolio).where(
-            Portfolio.id == portfolio_id,
-            Portfolio.user_id == current_user.id
-        )
-        portfolio_result = await db.execute(portfolio_stmt)
-        portfolio = portfolio_result.scalar_one_or_none()
-        
-        if not portfolio:
+        if not await portfolio_is_owned(db, portfolio_id, current_user.id):
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail=f"Portfolio {portfolio_id} not found or access denied"
             )
         
+        # Reading and parsing are independent per file, so they overlap in
+        # worker threads; database writes stay serial on the request session
+        limiter = asyncio.Semaphore(settings.UPLOAD_PARSE_CONCURRENCY)
+        
+        async def read_and_parse(file: UploadFile):
+            async with limiter:
+                content = await _read_upload(file)
+                parsed = await anyio.to_thread.run_sync(
+                    ingestion_service.parse_file, content, file.filename
+                )
+                return content, parsed
+        
+        prepared = await asyncio.gather(*(read_and_parse(file) for file in files))
+        
         results = []
         
-        for file in files:
-            # Read file content
-            content = await file.read()
-            
+        for file, (content, parsed) in zip(files, prepared):
             # Process file
             result = await ingestion_service.process_file_upload(
                 db=db,
@@ -51,7 +79,8 @@ async def upload_file(
                 portfolio_id=portfolio_id,
                 file_content=content,
                 filename=file.filename,
-                file_type=file.content_type or "application/octet-stream"
+                file_type=file.content_type or "application/octet-stream",
+                parsed=parsed
             )
             
             results.append({
@@ -59,12 +88,17 @@ async def upload_file(
                 "result": result
             })
         
+        await response_cache.invalidate("dashboard", current_user.id)
+        await response_cache.invalidate("portfolios", current_user.id, portfolio_id)
+        
         return {
             "success": True,
             "results": results,
             "total_files": len(files)
         }
         
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error("Error processing file upload", error=str(e))
         raise HTTPException(
@@ -76,7 +110,7 @@ async def upload_file(
 @router.get("/status/{file_upload_id}")
 async def get_upload_status(
     file_upload_id: str,
-    current_user: User = Depends(get_current_user),
+    current_user: CurrentUser = Depends(get_current_user),
     db: AsyncSession = Depends(get_db)
 ):
     """Get file upload processing status"""
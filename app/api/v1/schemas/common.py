@@ -1,8 +1,8 @@
 from typing import List, Optional, Dict, Any, Generic, TypeVar
-from pydantic import BaseModel, Field
+from pydantic import BaseModel
 from datetime import datetime
 
-T = TypeVar('T')
+T = TypeVar('T', bound=BaseModel)
 
 class BaseResponse(BaseModel):
     """Base response model"""
@@ -24,13 +24,10 @@ class PaginatedResponse(BaseModel, Generic[T]):
     page: int = 1
     per_page: int = 50
     pages: int = 1
-    
-    class Config:
-        arbitrary_types_allowed = True
 
 
 class HealthCheckResponse(BaseModel):
     """Health check response"""
     status: str
     version: str
-    timestamp: datetime = Field(default_factory=datetime.now)
\ No newline at end of file
+    timestamp: Optional[datetime] = None
\ No newline at end of file
@@ -1,5 +1,5 @@
 from typing import Optional
-from datetime import date
+from datetime import date, datetime
 from decimal import Decimal
 from pydantic import BaseModel
 from enum import Enum
@@ -41,7 +41,7 @@ class CorporateActionResponse(BaseModel):
     """Schema for corporate action response"""
     id: str
     instrument_id: str
-    instrument_name: str
+    instrument_name: Optional[str] = None
     action_type: CorporateActionType
     status: CorporateActionStatus
     ex_date: date
@@ -51,5 +51,5 @@ class CorporateActionResponse(BaseModel):
     ratio_new: Optional[Decimal] = None
     cash_amount: Optional[Decimal] = None
     description: Optional[str] = None
-    created_at: date
-    updated_at: date
\ No newline at end of file
+    created_at: datetime
+    updated_at: datetime
\ No newline at end of file
@@ -6,7 +6,7 @@ from pydantic import BaseModel
 
 class TaxLotDetails(BaseModel):
     """Tax lot reference details"""
-    tax_lot_id: str
+    tax_lot_id: str  # "<buy_transaction_id>:<sell_transaction_id>"
     buy_transaction_id: str
     sell_transaction_id: str
 
@@ -36,4 +36,13 @@ class CapitalGainsResponse(BaseModel):
     total_short_term_gains: Decimal
     total_long_term_gains: Decimal
     net_capital_gains: Decimal
-    gains_items: List[CapitalGainsReportItem]
\ No newline at end of file
+    gains_items: List[CapitalGainsReportItem]
+
+class CapitalGainsSummaryResponse(BaseModel):
+    """Capital gains totals without the per-lot breakdown"""
+    financial_year: str
+    report_date: date
+    total_transactions: int
+    total_short_term_gains: Decimal
+    total_long_term_gains: Decimal
+    net_capital_gains: Decimal
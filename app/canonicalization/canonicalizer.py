@@ -3,12 +3,26 @@ from typing import Dict, List, Optional, Tuple, Any
 from dataclasses import dataclass
 import structlog
 import re
+import sys
 import hashlib
 from enum import Enum
+from functools import lru_cache
+from operator import itemgetter
+from cachetools import TTLCache
 
+from app.core.config import settings
 from app.db.models import AssetClass, Currency, Exchange
 
 
+# Everything except word characters, whitespace and hyphens
+_SPECIAL_CHARS = re.compile(r'[^\w\s\-]')
+
+# Same filter for ASCII names as a translate table, which skips the regex engine
+_ASCII_SPECIAL_CHARS = str.maketrans('', '', ''.join(
+    chr(code) for code in range(128) if _SPECIAL_CHARS.match(chr(code))
+))
+
+
 class IdentifierType(str, Enum):
     """Types of instrument identifiers"""
     ISIN = "isin"
@@ -18,7 +32,7 @@ class IdentifierType(str, Enum):
     MANUAL = "manual"
 
 
-@dataclass
+@dataclass(slots=True)
 class InstrumentIdentifier:
     """Standardized instrument identifier"""
     identifier_type: IdentifierType
@@ -29,13 +43,15 @@ class InstrumentIdentifier:
     def __post_init__(self):
         """Normalize identifier value"""
         self.value = self.value.strip().upper()
+        # Exchange and country codes repeat across every row; interned copies are
+        # shared and compare by identity
         if self.exchange:
-            self.exchange = self.exchange.strip().upper()
+            self.exchange = sys.intern(self.exchange.strip().upper())
         if self.country:
-            self.country = self.country.strip().upper()
+            self.country = sys.intern(self.country.strip().upper())
 
 
-@dataclass
+@dataclass(slots=True)
 class CanonicalInstrument:
     """Canonical representation of an instrument"""
     canonical_id: str
@@ -44,8 +60,8 @@ class CanonicalInstrument:
     currency: Currency
     primary_exchange: Optional[Exchange]
     
-    # All known identifiers
-    identifiers: List[InstrumentIdentifier]
+    # All known identifiers, at most one per type (mirrors the instrument columns)
+    identifiers: Dict[IdentifierType, InstrumentIdentifier]
     
     # Additional metadata
     sector: Optional[str] = None
@@ -81,21 +97,31 @@ class ExactMatcher(InstrumentMatcher):
         existing_instruments: List[CanonicalInstrument]
     ) -> List[Tuple[CanonicalInstrument, float]]:
         """Find exact matches"""
+        if not query_identifiers or not existing_instruments:
+            return []
+        
+        # Index existing identifiers once so each query identifier is a single lookup
+        index: Dict[Tuple[IdentifierType, str], List[Tuple[CanonicalInstrument, Optional[str]]]] = {}
+        for instrument in existing_instruments:
+            for existing_id in instrument.identifiers.values():
+                index.setdefault((existing_id.identifier_type, existing_id.value), []).append(
+                    (instrument, existing_id.exchange)
+                )
+        
         matches = []
+        matched_ids = set()
         
         for query_id in query_identifiers:
-            for instrument in existing_instruments:
-                for existing_id in instrument.identifiers:
-                    if (query_id.identifier_type == existing_id.identifier_type and
-                        query_id.value == existing_id.value):
-                        
-                        # Check exchange match if both specified
-                        if (query_id.exchange and existing_id.exchange and 
-                            query_id.exchange != existing_id.exchange):
-                            continue
-                        
-                        matches.append((instrument, 1.0))
-                        break
+            query_exchange = query_id.exchange
+            
+            for instrument, exchange in index.get((query_id.identifier_type, query_id.value), ()):
+                # Check exchange match if both specified
+                if query_exchange and exchange and query_exchange != exchange:
+                    continue
+                
+                if instrument.canonical_id not in matched_ids:
+                    matched_ids.add(instrument.canonical_id)
+                    matches.append((instrument, 1.0))
         
         return matches
 
@@ -139,24 +165,34 @@ class NameNormalizer:
         }
         
         # Words to remove
-        self.stop_words = {'THE', 'OF', 'AND', 'OR', 'FOR', 'WITH', 'BY'}
+        self.stop_words = frozenset({'THE', 'OF', 'AND', 'OR', 'FOR', 'WITH', 'BY'})
         
         # Common company suffixes
-        self.company_suffixes = {
+        self.company_suffixes = frozenset({
             'LIMITED', 'LTD', 'PRIVATE', 'PVT', 'CORPORATION', 'CORP',
             'INCORPORATED', 'INC', 'COMPANY', 'CO', 'LLC', 'LLP'
-        }
+        })
+        
+        # Bulk ingests normalize the same few names over and over
+        self._normalize_cached = lru_cache(maxsize=16384)(self._normalize)
     
     def normalize(self, name: str) -> str:
         """Normalize instrument name for matching"""
         if not name:
             return ""
         
+        return self._normalize_cached(name)
+    
+    def _normalize(self, name: str) -> str:
+        
         # Convert to uppercase
         normalized = name.upper().strip()
         
         # Remove special characters except spaces and hyphens
-        normalized = re.sub(r'[^\w\s\-]', '', normalized)
+        if normalized.isascii():
+            normalized = normalized.translate(_ASCII_SPECIAL_CHARS)
+        else:
+            normalized = _SPECIAL_CHARS.sub('', normalized)
         
         # Split into words
         words = normalized.split()
@@ -185,18 +221,47 @@ class NameNormalizer:
         return keywords
 
 
+@lru_cache(maxsize=4096)
+def _manual_name_hash(name: str) -> str:
+    """Stable short hash of a manual asset's name
+    
+    Stored canonical IDs depend on this exact digest, so the algorithm must not change.
+    """
+    return hashlib.md5(name.encode('utf-8')).hexdigest()[:8].upper()
+
+
+# Identifiers that pin down a single instrument globally
+_DEFINITIVE_IDENTIFIER_TYPES = frozenset({
+    IdentifierType.ISIN, IdentifierType.AMFI_CODE, IdentifierType.CUSIP
+})
+
+
+# Primary identifier preference: ISIN > AMFI > CUSIP > SYMBOL > MANUAL
+_IDENTIFIER_PRIORITY = {
+    IdentifierType.ISIN: 1,
+    IdentifierType.AMFI_CODE: 2,
+    IdentifierType.CUSIP: 3,
+    IdentifierType.SYMBOL: 4,
+    IdentifierType.MANUAL: 5
+}
+
+
 class CanonicalIdGenerator:
     """Generator for canonical instrument IDs"""
     
     @staticmethod
     def generate(
-        primary_identifier: InstrumentIdentifier,
+        primary_identifier: Optional[InstrumentIdentifier],
         asset_class: AssetClass,
         name: str
     ) -> str:
         """Generate canonical ID based on primary identifier"""
         
-        if primary_identifier.identifier_type == IdentifierType.ISIN:
+        if primary_identifier is None:
+            # Name-only instruments are identified like manual assets
+            return f"MANUAL:{asset_class.value.upper()}:{_manual_name_hash(name)}"
+        
+        elif primary_identifier.identifier_type == IdentifierType.ISIN:
             return f"ISIN:{primary_identifier.value}"
         
         elif primary_identifier.identifier_type == IdentifierType.AMFI_CODE:
@@ -211,25 +276,31 @@ class CanonicalIdGenerator:
         
         else:  # Manual or unknown
             # Generate hash-based ID for manual assets
-            name_hash = hashlib.md5(name.encode('utf-8')).hexdigest()[:8].upper()
-            return f"MANUAL:{asset_class.value.upper()}:{name_hash}"
+            return f"MANUAL:{asset_class.value.upper()}:{_manual_name_hash(name)}"
 
 
 class InstrumentCanonicalizer:
     """Main canonicalization service"""
     
-    def __init__(self):
+    def __init__(self, cache_max_size: Optional[int] = None, cache_ttl_seconds: Optional[int] = None):
         self.logger = structlog.get_logger("InstrumentCanonicalizer")
         self.name_normalizer = NameNormalizer()
         
-        # Initialize matchers
-        self.matchers = [
+        # Initialize matchers; FuzzyNameMatcher joins once it returns matches,
+        # until then it is a wasted call on every canonicalize
+        self.matchers: List[InstrumentMatcher] = [
             ExactMatcher(),
-            FuzzyNameMatcher(),
         ]
         
-        # Cache for performance
-        self._cache: Dict[str, CanonicalInstrument] = {}
+        # Bounded LRU cache with expiry so long-lived workers neither grow
+        # without limit nor keep stale matches forever. Only touched from the
+        # event loop, so no lock is needed.
+        cache_max_size = cache_max_size or settings.CANONICAL_CACHE_MAX_SIZE
+        cache_ttl_seconds = cache_ttl_seconds or settings.CANONICAL_CACHE_TTL_SECONDS
+        self._cache: TTLCache = TTLCache(maxsize=cache_max_size, ttl=cache_ttl_seconds)
+        
+        # Cached instruments by canonical ID, for identifier updates
+        self._by_canonical_id: TTLCache = TTLCache(maxsize=cache_max_size, ttl=cache_ttl_seconds)
     
     def canonicalize(
         self,
@@ -246,24 +317,26 @@ class InstrumentCanonicalizer:
         cache_key = self._create_cache_key(name, identifiers)
         
         # Check cache first
-        if cache_key in self._cache:
-            return self._cache[cache_key]
+        cached = self._cache.get(cache_key)
+        if cached is not None:
+            return cached
         
         # Try to find matches in existing instruments
         matches = self._find_matches(identifiers, existing_instruments)
         
         if matches:
             # Return best match
-            best_match = max(matches, key=lambda x: x[1])[0]
+            best_match, confidence = max(matches, key=itemgetter(1))
             self.logger.info(
                 "Found existing instrument match",
                 name=name,
                 canonical_id=best_match.canonical_id,
-                confidence=max(matches, key=lambda x: x[1])[1]
+                confidence=confidence
             )
             
             # Update cache
             self._cache[cache_key] = best_match
+            self._by_canonical_id.setdefault(best_match.canonical_id, best_match)
             return best_match
         
         # Create new canonical instrument
@@ -273,6 +346,7 @@ class InstrumentCanonicalizer:
         
         # Update cache
         self._cache[cache_key] = canonical_instrument
+        self._by_canonical_id.setdefault(canonical_instrument.canonical_id, canonical_instrument)
         
         self.logger.info(
             "Created new canonical instrument",
@@ -290,9 +364,24 @@ class InstrumentCanonicalizer:
     ) -> List[Tuple[CanonicalInstrument, float]]:
         """Find matches using all matchers"""
         all_matches = []
+        definitive_keys = {
+            (identifier.identifier_type, identifier.value)
+            for identifier in query_identifiers
+            if identifier.identifier_type in _DEFINITIVE_IDENTIFIER_TYPES
+        }
         
         for matcher in self.matchers:
             matches = matcher.match(query_identifiers, existing_instruments)
+            
+            # An exact hit on a globally unique identifier can't be beaten; skip the remaining matchers
+            if definitive_keys:
+                for instrument, confidence in matches:
+                    if confidence >= 1.0 and any(
+                        (identifier.identifier_type, identifier.value) in definitive_keys
+                        for identifier in instrument.identifiers.values()
+                    ):
+                        return [(instrument, confidence)]
+            
             all_matches.extend(matches)
         
         # Remove duplicates and sort by confidence
@@ -331,35 +420,24 @@ class InstrumentCanonicalizer:
             asset_class=asset_class,
             currency=currency,
             primary_exchange=exchange,
-            identifiers=identifiers,
+            identifiers={identifier.identifier_type: identifier for identifier in identifiers},
             confidence_score=1.0
         )
     
-    def _select_primary_identifier(self, identifiers: List[InstrumentIdentifier]) -> InstrumentIdentifier:
+    def _select_primary_identifier(self, identifiers: List[InstrumentIdentifier]) -> Optional[InstrumentIdentifier]:
         """Select the best identifier as primary"""
         
-        # Priority order: ISIN > AMFI > CUSIP > SYMBOL > MANUAL
-        priority = {
-            IdentifierType.ISIN: 1,
-            IdentifierType.AMFI_CODE: 2,
-            IdentifierType.CUSIP: 3,
-            IdentifierType.SYMBOL: 4,
-            IdentifierType.MANUAL: 5
-        }
+        if not identifiers:
+            return None
         
-        # Sort by priority and return first
-        sorted_identifiers = sorted(identifiers, key=lambda x: priority.get(x.identifier_type, 99))
-        return sorted_identifiers[0] if sorted_identifiers else identifiers[0]
+        return min(identifiers, key=lambda x: _IDENTIFIER_PRIORITY.get(x.identifier_type, 99))
     
-    def _create_cache_key(self, name: str, identifiers: List[InstrumentIdentifier]) -> str:
+    def _create_cache_key(self, name: str, identifiers: List[InstrumentIdentifier]) -> Tuple:
         """Create cache key for instrument"""
-        # Sort identifiers for consistent key
-        sorted_ids = sorted(
-            [(id.identifier_type.value, id.value, id.exchange or "") for id in identifiers]
-        )
-        
-        key_parts = [name] + [f"{t}:{v}:{e}" for t, v, e in sorted_ids]
-        return hashlib.md5("|".join(key_parts).encode()).hexdigest()
+        # Plain tuples hash cheaply and stay readable; sorted for a consistent key
+        return (name, tuple(sorted(
+            (id.identifier_type.value, id.value, id.exchange or "") for id in identifiers
+        )))
     
     def add_identifier_mapping(
         self,
@@ -369,31 +447,30 @@ class InstrumentCanonicalizer:
         """Add new identifier mapping to existing instrument"""
         
         # Find instrument in cache
-        for cached_instrument in self._cache.values():
-            if cached_instrument.canonical_id == canonical_id:
-                # Check if identifier already exists
-                for existing_id in cached_instrument.identifiers:
-                    if (existing_id.identifier_type == new_identifier.identifier_type and
-                        existing_id.value == new_identifier.value):
-                        return False  # Already exists
-                
-                # Add new identifier
-                cached_instrument.identifiers.append(new_identifier)
-                
-                self.logger.info(
-                    "Added identifier mapping",
-                    canonical_id=canonical_id,
-                    identifier_type=new_identifier.identifier_type.value,
-                    identifier_value=new_identifier.value
-                )
-                
-                return True
+        cached_instrument = self._by_canonical_id.get(canonical_id)
+        if cached_instrument is None:
+            return False
+        
+        # Like the database columns, an identifier type is only ever filled, never replaced
+        if new_identifier.identifier_type in cached_instrument.identifiers:
+            return False
+        
+        # Add new identifier
+        cached_instrument.identifiers[new_identifier.identifier_type] = new_identifier
+        
+        self.logger.info(
+            "Added identifier mapping",
+            canonical_id=canonical_id,
+            identifier_type=new_identifier.identifier_type.value,
+            identifier_value=new_identifier.value
+        )
         
-        return False
+        return True
     
     def clear_cache(self):
         """Clear the canonicalization cache"""
         self._cache.clear()
+        self._by_canonical_id.clear()
         self.logger.info("Cleared canonicalization cache")
 
 
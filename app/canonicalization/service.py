@@ -1,6 +1,7 @@
-from typing import List, Dict, Optional, Any
+from typing import List, Dict, Optional, Any, Tuple, Union
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select
+from sqlalchemy import select, and_, or_, ColumnElement, Row
+from cachetools import TTLCache
 import structlog
 
 from app.canonicalization.canonicalizer import (
@@ -9,15 +10,60 @@ from app.canonicalization.canonicalizer import (
     IdentifierType,
     CanonicalInstrument
 )
+from app.core.config import settings
 from app.db.models import Instrument, AssetClass, Currency, Exchange
 
 
+# Instrument column holding each identifier type
+_IDENTIFIER_COLUMNS = {
+    IdentifierType.ISIN: Instrument.isin,
+    IdentifierType.AMFI_CODE: Instrument.amfi_code,
+    IdentifierType.CUSIP: Instrument.cusip,
+    IdentifierType.SYMBOL: Instrument.symbol,
+}
+
+# Exchange codes accepted from upload rows
+_EXCHANGE_MAP = {
+    "NSE": Exchange.NSE,
+    "BSE": Exchange.BSE,
+    "NASDAQ": Exchange.NASDAQ,
+    "NYSE": Exchange.NYSE,
+    "MANUAL": Exchange.MANUAL,
+}
+
+# Columns _db_to_canonical reads
+_CANONICAL_COLUMNS = (
+    Instrument.canonical_id,
+    Instrument.name,
+    Instrument.asset_class,
+    Instrument.currency,
+    Instrument.isin,
+    Instrument.amfi_code,
+    Instrument.cusip,
+    Instrument.symbol,
+    Instrument.primary_exchange,
+    Instrument.sector,
+    Instrument.industry,
+    Instrument.country,
+    Instrument.face_value,
+    Instrument.lot_size,
+    Instrument.is_active,
+)
+
+
 class InstrumentMappingService:
     """Service for managing instrument mappings and canonicalization"""
     
     def __init__(self):
         self.logger = structlog.get_logger("InstrumentMappingService")
         self.canonicalizer = InstrumentCanonicalizer()
+        
+        # Identifiers already resolved to a database instrument, so repeat rows
+        # in bulk imports skip the candidate query and canonicalization
+        self._resolved_ids: TTLCache = TTLCache(
+            maxsize=settings.CANONICAL_CACHE_MAX_SIZE,
+            ttl=settings.CANONICAL_CACHE_TTL_SECONDS,
+        )
     
     async def find_or_create_instrument(
         self,
@@ -33,6 +79,14 @@ class InstrumentMappingService:
         # Convert identifiers to structured format
         structured_identifiers = self._parse_identifiers(identifiers, exchange)
         
+        instrument_id = self._cached_instrument_id(structured_identifiers)
+        if instrument_id is not None:
+            instrument = await db.get(Instrument, instrument_id)
+            if instrument is not None and instrument.is_active:
+                await self._update_instrument_identifiers(db, instrument, structured_identifiers)
+                return instrument
+            # Stale entry (merged away or rolled back): resolve from scratch
+        
         # Load existing instruments for matching
         existing_canonical = await self._load_existing_instruments(db, structured_identifiers)
         
@@ -53,10 +107,12 @@ class InstrumentMappingService:
         if existing_instrument:
             # Update existing instrument with new identifiers if needed
             await self._update_instrument_identifiers(db, existing_instrument, structured_identifiers)
+            self._remember_resolution(structured_identifiers, existing_instrument)
             return existing_instrument
         
         # Create new instrument in database
         new_instrument = await self._create_db_instrument(db, canonical_instrument)
+        self._remember_resolution(structured_identifiers, new_instrument)
         
         self.logger.info(
             "Created new instrument",
@@ -67,6 +123,79 @@ class InstrumentMappingService:
         
         return new_instrument
     
+    async def find_or_create_many(
+        self,
+        db: AsyncSession,
+        rows: List[Tuple[str, Dict[str, Optional[str]], AssetClass, Currency, Optional[str]]]
+    ) -> List[Instrument]:
+        """Find or create instruments for a batch of (name, identifiers, asset_class, currency, exchange) rows
+        
+        Uses one candidate query, one canonical_id query and one flush for the
+        whole batch instead of several round trips per row.
+        """
+        
+        if not rows:
+            return []
+        
+        structured_rows = [self._parse_identifiers(identifiers, exchange) for _, identifiers, _, _, exchange in rows]
+        
+        # One query for every instrument any row could match
+        candidates = await self._query_candidate_instruments(
+            db, [identifier for structured in structured_rows for identifier in structured]
+        )
+        instruments_by_canonical_id = {instrument.canonical_id: instrument for instrument in candidates}
+        existing_canonical = [self._db_to_canonical(instrument) for instrument in candidates]
+        
+        # Canonicalize in memory; instruments new to this batch are matchable by later rows
+        canonical_rows = []
+        for (name, _, asset_class, currency, exchange), structured in zip(rows, structured_rows):
+            canonical = self.canonicalizer.canonicalize(
+                name=name,
+                identifiers=structured,
+                asset_class=asset_class,
+                currency=currency,
+                existing_instruments=existing_canonical,
+                exchange=self._parse_exchange(exchange) if exchange else None
+            )
+            if canonical.canonical_id not in instruments_by_canonical_id:
+                existing_canonical.append(canonical)
+            canonical_rows.append(canonical)
+        
+        # Canonical ids the identifier query could not see (e.g. manual assets)
+        unseen_ids = {canonical.canonical_id for canonical in canonical_rows} - instruments_by_canonical_id.keys()
+        if unseen_ids:
+            result = await db.execute(select(Instrument).where(Instrument.canonical_id.in_(unseen_ids)))
+            for instrument in result.scalars():
+                instruments_by_canonical_id[instrument.canonical_id] = instrument
+        
+        new_instruments = []
+        instruments = []
+        for canonical, structured in zip(canonical_rows, structured_rows):
+            instrument = instruments_by_canonical_id.get(canonical.canonical_id)
+            
+            if instrument is None:
+                instrument = self._build_db_instrument(canonical)
+                instruments_by_canonical_id[canonical.canonical_id] = instrument
+                new_instruments.append(instrument)
+            else:
+                self._apply_identifiers(instrument, structured)
+            
+            instruments.append(instrument)
+        
+        db.add_all(new_instruments)
+        await db.flush()
+        
+        for instrument, structured in zip(instruments, structured_rows):
+            self._remember_resolution(structured, instrument)
+        
+        self.logger.info(
+            "Resolved instrument batch",
+            rows=len(rows),
+            created=len(new_instruments)
+        )
+        
+        return instruments
+    
     async def resolve_instrument_conflicts(
         self,
         db: AsyncSession,
@@ -126,6 +255,38 @@ class InstrumentMappingService:
         
         return True
     
+    @staticmethod
+    def _identifier_key(identifier: InstrumentIdentifier) -> Tuple[IdentifierType, str, str]:
+        """Cache key for one identifier; exchange is part of a symbol's identity"""
+        return (identifier.identifier_type, identifier.value, identifier.exchange or "")
+    
+    def _cached_instrument_id(self, identifiers: List[InstrumentIdentifier]) -> Optional[str]:
+        """Instrument the identifiers were already resolved to, if that is unambiguous
+        
+        Identifiers come in priority order (ISIN first). The primary one must be
+        cached: a lower-priority hit (e.g. a symbol) says nothing about which
+        instrument owns an uncached ISIN. Any other cached identifier must
+        agree, otherwise full resolution decides.
+        """
+        if not identifiers:
+            return None
+        
+        instrument_id = self._resolved_ids.get(self._identifier_key(identifiers[0]))
+        if instrument_id is None:
+            return None
+        
+        for identifier in identifiers[1:]:
+            other_id = self._resolved_ids.get(self._identifier_key(identifier))
+            if other_id is not None and other_id != instrument_id:
+                return None
+        
+        return instrument_id
+    
+    def _remember_resolution(self, identifiers: List[InstrumentIdentifier], instrument: Instrument) -> None:
+        """Record which instrument each identifier resolved to"""
+        for identifier in identifiers:
+            self._resolved_ids[self._identifier_key(identifier)] = instrument.id
+    
     def _parse_identifiers(
         self, 
         identifiers: Dict[str, Optional[str]], 
@@ -166,15 +327,7 @@ class InstrumentMappingService:
     
     def _parse_exchange(self, exchange_str: str) -> Optional[Exchange]:
         """Parse exchange string to enum"""
-        exchange_mapping = {
-            "NSE": Exchange.NSE,
-            "BSE": Exchange.BSE,
-            "NASDAQ": Exchange.NASDAQ,
-            "NYSE": Exchange.NYSE,
-            "MANUAL": Exchange.MANUAL,
-        }
-        
-        return exchange_mapping.get(exchange_str.upper()) if exchange_str else None
+        return _EXCHANGE_MAP.get(exchange_str.upper()) if exchange_str else None
     
     async def _load_existing_instruments(
         self, 
@@ -183,77 +336,83 @@ class InstrumentMappingService:
     ) -> List[CanonicalInstrument]:
         """Load existing instruments that might match"""
         
-        # Build query conditions for potential matches
-        conditions = []
+        candidate_filter = self._candidate_filter(identifiers)
+        if candidate_filter is None:
+            return []
         
-        for identifier in identifiers:
-            if identifier.identifier_type == IdentifierType.ISIN:
-                conditions.append(Instrument.isin == identifier.value)
-            elif identifier.identifier_type == IdentifierType.AMFI_CODE:
-                conditions.append(Instrument.amfi_code == identifier.value)
-            elif identifier.identifier_type == IdentifierType.CUSIP:
-                conditions.append(Instrument.cusip == identifier.value)
-            elif identifier.identifier_type == IdentifierType.SYMBOL:
-                if identifier.exchange:
-                    conditions.append(
-                        (Instrument.symbol == identifier.value) & 
-                        (Instrument.primary_exchange == identifier.exchange)
-                    )
-                else:
-                    conditions.append(Instrument.symbol == identifier.value)
-        
-        if not conditions:
+        # Matching only reads these columns, so skip ORM hydration and the identity map
+        result = await db.execute(select(*_CANONICAL_COLUMNS).where(candidate_filter))
+        
+        return [self._db_to_canonical(row) for row in result]
+    
+    async def _query_candidate_instruments(
+        self,
+        db: AsyncSession,
+        identifiers: List[InstrumentIdentifier]
+    ) -> List[Instrument]:
+        """Query database instruments sharing any of the identifiers"""
+        
+        candidate_filter = self._candidate_filter(identifiers)
+        if candidate_filter is None:
             return []
         
-        # Execute query with OR conditions
-        stmt = select(Instrument).where(
-            conditions[0] if len(conditions) == 1 else 
-            conditions[0] | conditions[1] if len(conditions) == 2 else
-            conditions[0] | conditions[1] | conditions[2] if len(conditions) == 3 else
-            conditions[0] | conditions[1] | conditions[2] | conditions[3]
-        )
+        result = await db.execute(select(Instrument).where(candidate_filter))
+        return list(result.scalars().all())
+    
+    def _candidate_filter(self, identifiers: List[InstrumentIdentifier]) -> Optional[ColumnElement[bool]]:
+        """WHERE clause matching instruments that share any of the identifiers"""
         
-        result = await db.execute(stmt)
-        db_instruments = result.scalars().all()
+        # Group identifiers by column so each indexed column gets one IN clause
+        values_by_type: Dict[IdentifierType, List[str]] = {}
+        symbol_exchanges = []
         
-        # Convert to canonical format
-        canonical_instruments = []
-        for db_instrument in db_instruments:
-            canonical = self._db_to_canonical(db_instrument)
-            canonical_instruments.append(canonical)
+        for identifier in identifiers:
+            if identifier.identifier_type == IdentifierType.SYMBOL and identifier.exchange:
+                symbol_exchanges.append((identifier.value, identifier.exchange))
+            elif identifier.identifier_type in _IDENTIFIER_COLUMNS:
+                values_by_type.setdefault(identifier.identifier_type, []).append(identifier.value)
+        
+        conditions = [
+            _IDENTIFIER_COLUMNS[identifier_type].in_(values)
+            for identifier_type, values in values_by_type.items()
+        ]
+        conditions.extend(
+            and_(Instrument.symbol == symbol, Instrument.primary_exchange == exchange)
+            for symbol, exchange in symbol_exchanges
+        )
         
-        return canonical_instruments
+        return or_(*conditions) if conditions else None
     
-    def _db_to_canonical(self, db_instrument: Instrument) -> CanonicalInstrument:
-        """Convert database instrument to canonical format"""
+    def _db_to_canonical(self, db_instrument: Union[Instrument, Row]) -> CanonicalInstrument:
+        """Convert a database instrument (or a row of _CANONICAL_COLUMNS) to canonical format"""
         
         # Collect all identifiers
-        identifiers = []
+        identifiers = {}
         
         if db_instrument.isin:
-            identifiers.append(InstrumentIdentifier(
+            identifiers[IdentifierType.ISIN] = InstrumentIdentifier(
                 identifier_type=IdentifierType.ISIN,
                 value=db_instrument.isin
-            ))
+            )
         
         if db_instrument.amfi_code:
-            identifiers.append(InstrumentIdentifier(
+            identifiers[IdentifierType.AMFI_CODE] = InstrumentIdentifier(
                 identifier_type=IdentifierType.AMFI_CODE,
                 value=db_instrument.amfi_code
-            ))
+            )
         
         if db_instrument.cusip:
-            identifiers.append(InstrumentIdentifier(
+            identifiers[IdentifierType.CUSIP] = InstrumentIdentifier(
                 identifier_type=IdentifierType.CUSIP,
                 value=db_instrument.cusip
-            ))
+            )
         
         if db_instrument.symbol:
-            identifiers.append(InstrumentIdentifier(
+            identifiers[IdentifierType.SYMBOL] = InstrumentIdentifier(
                 identifier_type=IdentifierType.SYMBOL,
                 value=db_instrument.symbol,
                 exchange=db_instrument.primary_exchange.value if db_instrument.primary_exchange else None
-            ))
+            )
         
         return CanonicalInstrument(
             canonical_id=db_instrument.canonical_id,
@@ -288,22 +447,32 @@ class InstrumentMappingService:
     ) -> Instrument:
         """Create new instrument in database"""
         
+        instrument = self._build_db_instrument(canonical)
+        
+        db.add(instrument)
+        await db.flush()
+        
+        return instrument
+    
+    def _build_db_instrument(self, canonical: CanonicalInstrument) -> Instrument:
+        """Build (without persisting) the database row for a canonical instrument"""
+        
         # Extract individual identifiers
-        isin = next((id.value for id in canonical.identifiers if id.identifier_type == IdentifierType.ISIN), None)
-        amfi_code = next((id.value for id in canonical.identifiers if id.identifier_type == IdentifierType.AMFI_CODE), None)
-        cusip = next((id.value for id in canonical.identifiers if id.identifier_type == IdentifierType.CUSIP), None)
-        symbol = next((id.value for id in canonical.identifiers if id.identifier_type == IdentifierType.SYMBOL), None)
+        isin = canonical.identifiers.get(IdentifierType.ISIN)
+        amfi_code = canonical.identifiers.get(IdentifierType.AMFI_CODE)
+        cusip = canonical.identifiers.get(IdentifierType.CUSIP)
+        symbol = canonical.identifiers.get(IdentifierType.SYMBOL)
         
-        instrument = Instrument(
+        return Instrument(
             canonical_id=canonical.canonical_id,
             name=canonical.name,
             asset_class=canonical.asset_class,
             currency=canonical.currency,
-            isin=isin,
-            amfi_code=amfi_code,
-            cusip=cusip,
+            isin=isin.value if isin else None,
+            amfi_code=amfi_code.value if amfi_code else None,
+            cusip=cusip.value if cusip else None,
             primary_exchange=canonical.primary_exchange,
-            symbol=symbol,
+            symbol=symbol.value if symbol else None,
             sector=canonical.sector,
             industry=canonical.industry,
             country=canonical.country,
@@ -311,11 +480,6 @@ class InstrumentMappingService:
             lot_size=canonical.lot_size,
             is_active=canonical.is_active
         )
-        
-        db.add(instrument)
-        await db.flush()
-        
-        return instrument
     
     async def _update_instrument_identifiers(
         self,
@@ -325,27 +489,40 @@ class InstrumentMappingService:
     ) -> bool:
         """Update existing instrument with new identifiers"""
         
-        updated = False
-        
-        for identifier in new_identifiers:
-            if identifier.identifier_type == IdentifierType.ISIN and not instrument.isin:
-                instrument.isin = identifier.value
-                updated = True
-            elif identifier.identifier_type == IdentifierType.AMFI_CODE and not instrument.amfi_code:
-                instrument.amfi_code = identifier.value
-                updated = True
-            elif identifier.identifier_type == IdentifierType.CUSIP and not instrument.cusip:
-                instrument.cusip = identifier.value
-                updated = True
-            elif identifier.identifier_type == IdentifierType.SYMBOL and not instrument.symbol:
-                instrument.symbol = identifier.value
-                updated = True
+        updated = self._apply_identifiers(instrument, new_identifiers)
         
         if updated:
             await db.commit()
         
         return updated
     
+    def _apply_identifiers(self, instrument: Instrument, new_identifiers: List[InstrumentIdentifier]) -> bool:
+        """Fill identifiers the instrument is missing; returns whether anything changed"""
+        
+        updated = False
+        
+        for identifier in new_identifiers:
+            # Enum members are singletons, so identity checks classify each identifier cheaply
+            identifier_type = identifier.identifier_type
+            if identifier_type is IdentifierType.ISIN:
+                if not instrument.isin:
+                    instrument.isin = identifier.value
+                    updated = True
+            elif identifier_type is IdentifierType.AMFI_CODE:
+                if not instrument.amfi_code:
+                    instrument.amfi_code = identifier.value
+                    updated = True
+            elif identifier_type is IdentifierType.CUSIP:
+                if not instrument.cusip:
+                    instrument.cusip = identifier.value
+                    updated = True
+            elif identifier_type is IdentifierType.SYMBOL:
+                if not instrument.symbol:
+                    instrument.symbol = identifier.value
+                    updated = True
+        
+        return updated
+    
     def _choose_primary_instrument(self, instruments: List[Instrument]) -> Instrument:
         """Choose the best instrument from conflicts"""
         
@@ -0,0 +1,107 @@
+from typing import Any, Optional
+import time
+import structlog
+from redis.asyncio import Redis
+from redis.exceptions import RedisError
+
+from app.core.config import settings
+
+
+class ResponseCache:
+    """Redis-backed cache for serialized GET responses
+
+    Keys are hierarchical (namespace:user_id:params) so write endpoints can
+    invalidate a whole namespace or one user's entries. Redis errors never
+    fail a request; the cache backs off and callers fall through to the DB.
+    """
+
+    KEY_PREFIX = "response-cache"
+
+    def __init__(self, url: str, password: Optional[str] = None, ttl_seconds: int = 60,
+                 enabled: bool = True, retry_after_seconds: int = 30):
+        self.logger = structlog.get_logger("ResponseCache")
+        self.url = url
+        self.password = password
+        self.ttl_seconds = ttl_seconds
+        self.enabled = enabled
+        self.retry_after_seconds = retry_after_seconds
+        self._client: Optional[Redis] = None
+        self._disabled_until = 0.0
+
+    def key(self, namespace: str, *parts: Any) -> str:
+        """Build a cache key from a namespace and vary-by parts"""
+        return ":".join([self.KEY_PREFIX, namespace] + ["" if part is None else str(part) for part in parts])
+
+    async def get(self, key: str) -> Optional[bytes]:
+        """Return the cached body for key, or None on miss or outage"""
+        client = self._get_client()
+        if client is None:
+            return None
+
+        try:
+            return await client.get(key)
+        except (RedisError, OSError) as e:
+            self._back_off(e)
+            return None
+
+    async def set(self, key: str, body: bytes, ttl_seconds: Optional[int] = None) -> None:
+        """Store a serialized body under key"""
+        client = self._get_client()
+        if client is None:
+            return
+
+        try:
+            await client.set(key, body, ex=ttl_seconds or self.ttl_seconds)
+        except (RedisError, OSError) as e:
+            self._back_off(e)
+
+    async def invalidate(self, namespace: str, *parts: Any) -> None:
+        """Delete every key under a namespace (optionally narrowed by leading parts)
+
+        Covers both the exact key (e.g. dashboard:<user_id>) and anything
+        nested below it (e.g. portfolios:<user_id>:<portfolio_id>:summary:...).
+        """
+        client = self._get_client()
+        if client is None:
+            return
+
+        prefix = self.key(namespace, *parts)
+
+        try:
+            keys = [key async for key in client.scan_iter(match=prefix + ":*", count=500)]
+            await client.delete(prefix, *keys)
+        except (RedisError, OSError) as e:
+            self._back_off(e)
+
+    async def close(self) -> None:
+        """Close the underlying connection pool"""
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+    def _get_client(self) -> Optional[Redis]:
+        if not self.enabled or time.monotonic() < self._disabled_until:
+            return None
+
+        if self._client is None:
+            self._client = Redis.from_url(
+                self.url,
+                password=self.password,
+                socket_connect_timeout=0.25,
+                socket_timeout=0.25,
+            )
+
+        return self._client
+
+    def _back_off(self, error: Exception) -> None:
+        self._disabled_until = time.monotonic() + self.retry_after_seconds
+        self.logger.warning("Response cache unavailable, falling back to database", error=str(error))
+
+
+# Global response cache instance
+response_cache = ResponseCache(
+    url=settings.REDIS_URL,
+    password=settings.REDIS_PASSWORD,
+    ttl_seconds=settings.RESPONSE_CACHE_TTL_SECONDS,
+    enabled=settings.RESPONSE_CACHE_ENABLED,
+)
@@ -16,16 +16,27 @@ class Settings(BaseSettings):
     SECRET_KEY: str
     ALGORITHM: str = "HS256"
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 30
+    TOKEN_CACHE_MAX_SIZE: int = 10_000
+    TOKEN_CACHE_TTL_SECONDS: int = 60
+    USER_CACHE_MAX_SIZE: int = 5_000
+    USER_CACHE_TTL_SECONDS: int = 30
+    THREADPOOL_MAX_WORKERS: int = 40
     ENCRYPTION_KEY: str
     
     # Database
     DATABASE_URL: str
-    DATABASE_POOL_SIZE: int = 10
-    DATABASE_MAX_OVERFLOW: int = 20
+    DATABASE_POOL_SIZE: int = 20
+    DATABASE_MAX_OVERFLOW: int = 30
+    DATABASE_POOL_RECYCLE_SECONDS: int = 300
+    DATABASE_POOL_TIMEOUT_SECONDS: int = 10
+    DATABASE_USE_PGBOUNCER: bool = False  # pooling is done by PgBouncer; use NullPool and no statement cache
+    DATABASE_STATEMENT_CACHE_SIZE: int = 1024
     
     # Redis
     REDIS_URL: str
     REDIS_PASSWORD: Optional[str] = None
+    RESPONSE_CACHE_ENABLED: bool = True
+    RESPONSE_CACHE_TTL_SECONDS: int = 60
     
     # CORS
     ALLOWED_ORIGINS: List[str] = ["*"]
@@ -34,6 +45,12 @@ class Settings(BaseSettings):
     # File Upload
     MAX_FILE_SIZE_MB: int = 10
     UPLOAD_DIR: str = "./uploads"
+    UPLOAD_PARSE_CONCURRENCY: int = 4
+    PDF_TEXT_BACKEND: str = "pypdf2"  # "pymupdf" once statements are verified against its layout
+    
+    # Instrument canonicalization
+    CANONICAL_CACHE_MAX_SIZE: int = 100_000
+    CANONICAL_CACHE_TTL_SECONDS: int = 3600
     ALLOWED_EXTENSIONS: List[str] = [".pdf", ".csv", ".xlsx", ".xls"]
     
     # External APIs
@@ -50,6 +67,8 @@ class Settings(BaseSettings):
     # Logging
     LOG_LEVEL: str = "INFO"
     LOG_FORMAT: str = "json"
+    LOG_BUFFER_RECORDS: int = 0  # stdlib records held before one write; 0 writes each immediately
+    LOG_QUEUE_SIZE: int = 10_000  # JSON lines queued for the background log writer; 0 writes inline
     SENTRY_DSN: Optional[str] = None
     
     # Financial Settings
@@ -1,25 +1,93 @@
 from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine, async_sessionmaker
 from sqlalchemy.orm import DeclarativeBase, Mapped, mapped_column
-from sqlalchemy import DateTime, func
+from sqlalchemy import Connection, DateTime, FetchedValue, func, text
 from typing import AsyncGenerator
+import os
+import time
 import uuid
 from datetime import datetime
 
 from app.core.config import settings
 
 
+def uuid7() -> str:
+    """Time-ordered UUID (RFC 9562 version 7) as a string
+    
+    The millisecond timestamp prefix makes new primary keys sort after
+    existing ones, so inserts append to the right edge of the index instead
+    of splitting random B-tree pages the way uuid4 keys do.
+    """
+    timestamp_ms = time.time_ns() // 1_000_000
+    rand = int.from_bytes(os.urandom(10), "big")
+    value = (
+        (timestamp_ms & 0xFFFF_FFFF_FFFF) << 80
+        | 0x7 << 76                         # version
+        | (rand >> 62 & 0xFFF) << 64        # rand_a
+        | 0b10 << 62                        # variant
+        | rand & 0x3FFF_FFFF_FFFF_FFFF      # rand_b
+    )
+    return str(uuid.UUID(int=value))
+
+
 class Base(DeclarativeBase):
     """Base model class with common fields"""
     
-    id: Mapped[str] = mapped_column(primary_key=True, default=lambda: str(uuid.uuid4()))
+    # Read server-maintained columns (updated_at) back with RETURNING rather
+    # than expiring them, which would need a lazy load under asyncio
+    __mapper_args__ = {"eager_defaults": True}
+    
+    id: Mapped[str] = mapped_column(primary_key=True, default=uuid7)
     created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), server_default=func.now())
     updated_at: Mapped[datetime] = mapped_column(
         DateTime(timezone=True), 
         server_default=func.now(), 
-        onupdate=func.now()
+        server_onupdate=FetchedValue(),  # set by the set_updated_at() trigger
     )
 
 
+_SET_UPDATED_AT_FUNCTION = """
+    CREATE OR REPLACE FUNCTION set_updated_at() RETURNS trigger AS $$
+    BEGIN
+        NEW.updated_at := now();
+        RETURN NEW;
+    END;
+    $$ LANGUAGE plpgsql
+"""
+
+
+def install_updated_at_triggers(connection: Connection) -> None:
+    """(Re)install the triggers that stamp updated_at on every UPDATE
+    
+    Runs against every mapped table with an updated_at column, not just the
+    ones create_all created, so existing databases get the triggers too.
+    UPDATE statements then only carry the columns that actually changed.
+    """
+    dialect = connection.dialect.name
+    if dialect == "postgresql":
+        connection.execute(text(_SET_UPDATED_AT_FUNCTION))
+    elif dialect != "sqlite":
+        return
+    
+    for table in Base.metadata.sorted_tables:
+        if "updated_at" not in table.c:
+            continue
+        
+        trigger = f"{table.name}_set_updated_at"
+        if dialect == "postgresql":
+            connection.execute(text(f"DROP TRIGGER IF EXISTS {trigger} ON {table.name}"))
+            connection.execute(text(
+                f"CREATE TRIGGER {trigger} BEFORE UPDATE ON {table.name} "
+                f"FOR EACH ROW EXECUTE FUNCTION set_updated_at()"
+            ))
+        else:
+            # SQLite (tests) can't assign NEW, so re-stamp the row after the update
+            connection.execute(text(f"DROP TRIGGER IF EXISTS {trigger}"))
+            connection.execute(text(
+                f"CREATE TRIGGER {trigger} AFTER UPDATE ON {table.name} FOR EACH ROW "
+                f"BEGIN UPDATE {table.name} SET updated_at = CURRENT_TIMESTAMP WHERE id = NEW.id; END"
+            ))
+
+
 # Create async engine with conditional parameters based on database type
 database_url = settings.DATABASE_URL.replace("postgresql://", "postgresql+asyncpg://")
 
@@ -32,12 +100,37 @@ if "sqlite" in database_url:
         connect_args={"check_same_thread": False},
         echo=settings.DEBUG,
     )
+elif settings.DATABASE_USE_PGBOUNCER:
+    # PostgreSQL behind PgBouncer: it owns the pool, and transaction pooling
+    # can't keep prepared statements across checkouts
+    from sqlalchemy.pool import NullPool
+    engine = create_async_engine(
+        database_url,
+        poolclass=NullPool,
+        connect_args={
+            "statement_cache_size": 0,
+            "prepared_statement_cache_size": 0,
+            "server_settings": {"jit": "off"},
+        },
+        echo=settings.DEBUG,
+    )
 else:
     # PostgreSQL configuration (for production)
     engine = create_async_engine(
         database_url,
         pool_size=settings.DATABASE_POOL_SIZE,
         max_overflow=settings.DATABASE_MAX_OVERFLOW,
+        pool_pre_ping=True,
+        pool_recycle=settings.DATABASE_POOL_RECYCLE_SECONDS,
+        # Fail fast with a clear error instead of queueing requests behind a saturated pool
+        pool_timeout=settings.DATABASE_POOL_TIMEOUT_SECONDS,
+        connect_args={
+            # asyncpg server-side statement cache and SQLAlchemy's prepared statement cache
+            "statement_cache_size": settings.DATABASE_STATEMENT_CACHE_SIZE,
+            "prepared_statement_cache_size": settings.DATABASE_STATEMENT_CACHE_SIZE,
+            # JIT compilation costs more than it saves on our short OLTP queries
+            "server_settings": {"jit": "off"},
+        },
         echo=settings.DEBUG,
     )
 
@@ -65,4 +158,7 @@ async def init_db() -> None:
         from app.db import models  # noqa: F401
         
         # Create all tables
-        await conn.run_sync(Base.metadata.create_all)
\ No newline at end of file
+        await conn.run_sync(Base.metadata.create_all)
+        
+        # Not tied to create_all: tables that already existed need them too
+        await conn.run_sync(install_updated_at_triggers)
\ No newline at end of file
@@ -1,12 +1,29 @@
 import structlog
+import atexit
 import logging
+import orjson
+import queue
 import sys
-from typing import Any, Dict
+import threading
+from typing import Any, BinaryIO, Dict, List
 from datetime import datetime
 
 from app.core.config import settings
 
 
+# Standard LogRecord attributes that are not user-supplied extras
+_STD_LOGRECORD_KEYS = frozenset({
+    "name", "msg", "args", "levelname", "levelno", "pathname",
+    "filename", "module", "lineno", "funcName", "created",
+    "msecs", "relativeCreated", "thread", "threadName",
+    "processName", "process", "message",
+})
+
+# Resolved once at import; nothing per-record reads settings
+_JSON_MODE = settings.LOG_FORMAT == "json"
+_LOG_LEVEL = getattr(logging, settings.LOG_LEVEL.upper())
+
+
 class StructlogFormatter(logging.Formatter):
     """Custom formatter for structured logging"""
     
@@ -20,43 +37,184 @@ class StructlogFormatter(logging.Formatter):
         
         # Add extra fields from the record
         for key, value in record.__dict__.items():
-            if key not in ["name", "msg", "args", "levelname", "levelno", "pathname",
-                          "filename", "module", "lineno", "funcName", "created",
-                          "msecs", "relativeCreated", "thread", "threadName",
-                          "processName", "process", "message"]:
+            if key not in _STD_LOGRECORD_KEYS:
                 log_data[key] = value
         
-        if settings.LOG_FORMAT == "json":
-            import json
-            return json.dumps(log_data)
+        if _JSON_MODE:
+            return orjson.dumps(log_data, default=str).decode()
         else:
             return f"{log_data['timestamp']} - {log_data['level']} - {log_data['message']}"
 
 
+class BufferedStreamHandler(logging.StreamHandler):
+    """StreamHandler that writes formatted records in batches
+    
+    Lines are held until capacity is reached or a WARNING-or-worse record
+    arrives, then written and flushed with a single write call.
+    """
+    
+    def __init__(self, stream=None, capacity: int = 64):
+        super().__init__(stream)
+        self.capacity = capacity
+        self._pending: List[str] = []
+    
+    def emit(self, record: logging.LogRecord) -> None:
+        try:
+            self._pending.append(self.format(record) + self.terminator)
+            if len(self._pending) >= self.capacity or record.levelno >= logging.WARNING:
+                self.flush()
+        except Exception:
+            self.handleError(record)
+    
+    def flush(self) -> None:
+        self.acquire()
+        try:
+            if self._pending:
+                self.stream.write("".join(self._pending))
+                self._pending.clear()
+            super().flush()
+        finally:
+            self.release()
+
+
+class QueuedLogWriter:
+    """Writes rendered log lines to a file from a background thread
+    
+    Callers only enqueue; the thread drains whatever is pending into a single
+    write and flush. When the queue is full, lines are dropped rather than
+    blocking the event loop, and the next write reports how many were lost.
+    """
+    
+    def __init__(self, file: BinaryIO, maxsize: int):
+        self.file = file
+        self._dropped = 0
+        self._dropped_lock = threading.Lock()
+        self._queue: queue.Queue = queue.Queue(maxsize=maxsize)
+        self._thread = threading.Thread(target=self._run, name="log-writer", daemon=True)
+        self._thread.start()
+        atexit.register(self.close)
+    
+    def put(self, line: bytes) -> None:
+        try:
+            self._queue.put_nowait(line)
+        except queue.Full:
+            with self._dropped_lock:
+                self._dropped += 1
+    
+    def close(self) -> None:
+        """Write out pending lines and stop the thread"""
+        if self._thread.is_alive():
+            self._queue.put(None)
+            self._thread.join(timeout=5)
+    
+    def _run(self) -> None:
+        while True:
+            lines = [self._queue.get()]
+            while lines[-1] is not None:
+                try:
+                    lines.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+            
+            stopping = lines[-1] is None
+            if stopping:
+                lines.pop()
+            
+            dropped = self._take_dropped()
+            if dropped:
+                lines.append(orjson.dumps({
+                    "event": "log lines dropped",
+                    "level": "warning",
+                    "dropped": dropped,
+                }) + b"\n")
+            
+            if lines:
+                try:
+                    self.file.write(b"".join(lines))
+                    self.file.flush()
+                except (OSError, ValueError):
+                    pass  # stdout went away; nowhere left to report it
+            
+            if stopping:
+                return
+    
+    def _take_dropped(self) -> int:
+        """Return and reset the count of lines lost to a full queue"""
+        with self._dropped_lock:
+            dropped, self._dropped = self._dropped, 0
+        return dropped
+
+
+class QueuedBytesLogger:
+    """structlog logger handing rendered bytes to a QueuedLogWriter"""
+    
+    def __init__(self, writer: QueuedLogWriter):
+        self._writer = writer
+    
+    def msg(self, message: bytes) -> None:
+        self._writer.put(message + b"\n")
+    
+    log = debug = info = warn = warning = msg
+    fatal = failure = err = error = critical = exception = msg
+
+
+_logging_configured = False
+
+
 def setup_logging() -> None:
-    """Setup structured logging configuration"""
+    """Setup structured logging configuration
+    
+    Idempotent: the app lifespan may run more than once per process (tests,
+    reloads) and handlers, the log writer thread and Sentry are set up once.
+    """
+    global _logging_configured
+    if _logging_configured:
+        return
+    _logging_configured = True
+    
+    # Configure standard library logging. Under load (uvicorn access logs,
+    # SQLAlchemy) records can be batched so many lines share one write;
+    # warnings and errors flush the batch immediately.
+    if settings.LOG_BUFFER_RECORDS > 0:
+        handler = BufferedStreamHandler(sys.stdout, capacity=settings.LOG_BUFFER_RECORDS)
+    else:
+        handler = logging.StreamHandler(sys.stdout)
     
-    # Configure standard library logging
     logging.basicConfig(
-        level=getattr(logging, settings.LOG_LEVEL.upper()),
+        level=_LOG_LEVEL,
         format="%(message)s",
-        handlers=[logging.StreamHandler(sys.stdout)],
+        handlers=[handler],
     )
     
-    # Configure structlog
-    structlog.configure(
-        processors=[
-            structlog.contextvars.merge_contextvars,
-            structlog.processors.add_log_level,
+    # Configure structlog; JSON lines are rendered to bytes by orjson and
+    # written to stdout's buffer, off the event loop when LOG_QUEUE_SIZE is set
+    if _JSON_MODE and settings.LOG_QUEUE_SIZE > 0:
+        writer = QueuedLogWriter(sys.stdout.buffer, maxsize=settings.LOG_QUEUE_SIZE)
+        logger_factory = lambda *args: QueuedBytesLogger(writer)
+    elif _JSON_MODE:
+        logger_factory = structlog.BytesLoggerFactory()
+    else:
+        logger_factory = structlog.PrintLoggerFactory()
+    
+    processors = [
+        structlog.contextvars.merge_contextvars,
+        structlog.processors.add_log_level,
+    ]
+    if settings.DEBUG:
+        # Only worth their per-call cost while debugging
+        processors += [
             structlog.processors.StackInfoRenderer(),
             structlog.dev.set_exc_info,
-            structlog.processors.JSONRenderer() if settings.LOG_FORMAT == "json" 
-            else structlog.dev.ConsoleRenderer(),
-        ],
-        wrapper_class=structlog.make_filtering_bound_logger(
-            getattr(logging, settings.LOG_LEVEL.upper())
-        ),
-        logger_factory=structlog.PrintLoggerFactory(),
+        ]
+    processors.append(
+        structlog.processors.JSONRenderer(serializer=orjson.dumps) if _JSON_MODE
+        else structlog.dev.ConsoleRenderer()
+    )
+    
+    structlog.configure(
+        processors=processors,
+        wrapper_class=structlog.make_filtering_bound_logger(_LOG_LEVEL),
+        logger_factory=logger_factory,
         cache_logger_on_first_use=True,
     )
     
@@ -1,70 +1,108 @@
-from fastapi import Request, Response
-from starlette.middleware.base import BaseHTTPMiddleware
-from typing import Callable
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+import itertools
+import secrets
 import time
 import structlog
-import uuid
 
 from app.core.config import settings
 
 
-class SecurityHeadersMiddleware(BaseHTTPMiddleware):
-    """Add security headers to all responses"""
+# Request IDs are a per-process random prefix plus a counter: unique across
+# workers and restarts without reading the system RNG on every request
+_REQUEST_ID_PREFIX = secrets.token_hex(6)
+_request_counter = itertools.count(1)
+
+
+# Probe and docs paths hit constantly by orchestrators; not worth an audit trail
+_UNAUDITED_PATHS = frozenset({"/health", "/docs", "/redoc", "/openapi.json", "/favicon.ico"})
+
+
+def _next_request_id() -> str:
+    return f"{_REQUEST_ID_PREFIX}-{next(_request_counter):x}"
+
+
+class SecurityHeadersMiddleware:
+    """Add security headers to all responses
     
-    async def dispatch(self, request: Request, call_next: Callable) -> Response:
-        response = await call_next(request)
+    Plain ASGI rather than BaseHTTPMiddleware: the headers are appended to
+    the response start message, so no Request/Response objects or extra
+    task are created per request.
+    """
+    
+    HEADERS = [
+        (b"x-content-type-options", b"nosniff"),
+        (b"x-frame-options", b"DENY"),
+        (b"x-xss-protection", b"1; mode=block"),
+        (b"strict-transport-security", b"max-age=31536000; includeSubDomains"),
+        (b"referrer-policy", b"strict-origin-when-cross-origin"),
+    ]
+    
+    def __init__(self, app: ASGIApp):
+        self.app = app
+    
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
         
-        # Add security headers
-        response.headers["X-Content-Type-Options"] = "nosniff"
-        response.headers["X-Frame-Options"] = "DENY"
-        response.headers["X-XSS-Protection"] = "1; mode=block"
-        response.headers["Strict-Transport-Security"] = "max-age=31536000; includeSubDomains"
-        response.headers["Referrer-Policy"] = "strict-origin-when-cross-origin"
+        async def send_with_headers(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                message["headers"] = list(message.get("headers", [])) + self.HEADERS
+            await send(message)
         
-        return response
+        await self.app(scope, receive, send_with_headers)
 
 
-class AuditLogMiddleware(BaseHTTPMiddleware):
+class AuditLogMiddleware:
     """Log all API requests for audit purposes"""
     
-    def __init__(self, app):
-        super().__init__(app)
+    def __init__(self, app: ASGIApp):
+        self.app = app
         self.logger = structlog.get_logger("audit")
     
-    async def dispatch(self, request: Request, call_next: Callable) -> Response:
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or scope["path"] in _UNAUDITED_PATHS:
+            await self.app(scope, receive, send)
+            return
+        
         # Generate request ID
-        request_id = str(uuid.uuid4())
+        request_id = _next_request_id()
         
         # Log request
-        start_time = time.time()
+        start_time = time.perf_counter()
+        
+        url = scope["path"]
+        if scope.get("query_string"):
+            url = f"{url}?{scope['query_string'].decode('latin-1')}"
+        client = scope.get("client")
+        user_agent = next((value for name, value in scope["headers"] if name == b"user-agent"), None)
         
         self.logger.info(
             "Request started",
             request_id=request_id,
-            method=request.method,
-            url=str(request.url),
-            client_ip=request.client.host if request.client else None,
-            user_agent=request.headers.get("user-agent"),
+            method=scope["method"],
+            url=url,
+            client_ip=client[0] if client else None,
+            user_agent=user_agent.decode("latin-1") if user_agent is not None else None,
         )
         
+        status_code = None
+        
+        async def send_with_request_id(message: Message) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+                message["headers"] = list(message.get("headers", [])) + [
+                    (b"x-request-id", request_id.encode("latin-1"))
+                ]
+            await send(message)
+        
         try:
-            response = await call_next(request)
-            
-            # Log response
-            process_time = time.time() - start_time
-            self.logger.info(
-                "Request completed",
-                request_id=request_id,
-                status_code=response.status_code,
-                process_time=round(process_time, 4),
-            )
-            
-            response.headers["X-Request-ID"] = request_id
-            return response
+            await self.app(scope, receive, send_with_request_id)
             
         except Exception as e:
             # Log error
-            process_time = time.time() - start_time
+            process_time = time.perf_counter() - start_time
             self.logger.error(
                 "Request failed",
                 request_id=request_id,
@@ -72,4 +110,13 @@ class AuditLogMiddleware(BaseHTTPMiddleware):
                 process_time=round(process_time, 4),
                 exc_info=True,
             )
-            raise
\ No newline at end of file
+            raise
+        
+        # Log response
+        process_time = time.perf_counter() - start_time
+        self.logger.info(
+            "Request completed",
+            request_id=request_id,
+            status_code=status_code,
+            process_time=round(process_time, 4),
+        )
@@ -14,6 +14,16 @@ from app.core.database import Base
 JsonType = JSON if "sqlite" in os.environ.get("DATABASE_URL", "").lower() else JSONB
 
 
+def _string_enum(enum_class: type) -> Enum:
+    """Enum column stored as VARCHAR plus a CHECK constraint, not a PostgreSQL ENUM type
+    
+    Stored values are still the member names, so existing rows read back
+    unchanged; adding a member no longer needs ALTER TYPE.
+    """
+    # Unnamed, so PostgreSQL names each CHECK after its table and column
+    return Enum(enum_class, native_enum=False, create_constraint=True, name=None)
+
+
 class AssetClass(str, enum.Enum):
     """Asset class enumeration"""
     EQUITY = "equity"
@@ -114,8 +124,8 @@ class Instrument(Base):
     
     # Basic info
     name: Mapped[str] = mapped_column(String(255))
-    asset_class: Mapped[AssetClass] = mapped_column(Enum(AssetClass))
-    currency: Mapped[Currency] = mapped_column(Enum(Currency))
+    asset_class: Mapped[AssetClass] = mapped_column(_string_enum(AssetClass))
+    currency: Mapped[Currency] = mapped_column(_string_enum(Currency))
     
     # Identifiers
     isin: Mapped[Optional[str]] = mapped_column(String(20), index=True)
@@ -123,7 +133,7 @@ class Instrument(Base):
     cusip: Mapped[Optional[str]] = mapped_column(String(20), index=True)
     
     # Exchange info
-    primary_exchange: Mapped[Optional[Exchange]] = mapped_column(Enum(Exchange))
+    primary_exchange: Mapped[Optional[Exchange]] = mapped_column(_string_enum(Exchange))
     symbol: Mapped[Optional[str]] = mapped_column(String(50))
     
     # Additional metadata
@@ -176,7 +186,11 @@ class Price(Base):
     instrument: Mapped["Instrument"] = relationship("Instrument", back_populates="prices")
     
     __table_args__ = (
-        Index("idx_price_instrument_date", "instrument_id", "price_date"),
+        # Covering: latest-price lookups read close prices straight from the index
+        Index(
+            "idx_price_instrument_date", "instrument_id", "price_date",
+            postgresql_include=["close_price", "adj_close_price"],
+        ),
     )
 
 
@@ -188,7 +202,7 @@ class Transaction(Base):
     instrument_id: Mapped[str] = mapped_column(String(36), ForeignKey("instruments.id"))
     
     # Transaction details
-    transaction_type: Mapped[TransactionType] = mapped_column(Enum(TransactionType))
+    transaction_type: Mapped[TransactionType] = mapped_column(_string_enum(TransactionType))
     transaction_date: Mapped[datetime] = mapped_column(DateTime(timezone=True))
     settlement_date: Mapped[Optional[datetime]] = mapped_column(DateTime(timezone=True))
     
@@ -204,7 +218,7 @@ class Transaction(Base):
     net_amount: Mapped[Decimal] = mapped_column(Numeric(15, 2))
     
     # Currency and FX
-    currency: Mapped[Currency] = mapped_column(Enum(Currency))
+    currency: Mapped[Currency] = mapped_column(_string_enum(Currency))
     fx_rate: Mapped[Decimal] = mapped_column(Numeric(15, 6), default=1.0)  # To base currency
     
     # Source information
@@ -245,7 +259,7 @@ class Position(Base):
     unrealized_pnl: Mapped[Optional[Decimal]] = mapped_column(Numeric(15, 2))
     
     # Currency
-    currency: Mapped[Currency] = mapped_column(Enum(Currency))
+    currency: Mapped[Currency] = mapped_column(_string_enum(Currency))
     
     # Last update
     last_updated: Mapped[datetime] = mapped_column(DateTime(timezone=True))
@@ -293,8 +307,8 @@ class CorporateAction(Base):
     instrument_id: Mapped[str] = mapped_column(String(36), ForeignKey("instruments.id"))
     
     # Action details
-    action_type: Mapped[CorporateActionType] = mapped_column(Enum(CorporateActionType))
-    status: Mapped[CorporateActionStatus] = mapped_column(Enum(CorporateActionStatus), default=CorporateActionStatus.PENDING)
+    action_type: Mapped[CorporateActionType] = mapped_column(_string_enum(CorporateActionType))
+    status: Mapped[CorporateActionStatus] = mapped_column(_string_enum(CorporateActionStatus), default=CorporateActionStatus.PENDING)
     ex_date: Mapped[date] = mapped_column(Date)
     record_date: Mapped[Optional[date]] = mapped_column(Date)
     payment_date: Mapped[Optional[date]] = mapped_column(Date)
@@ -357,8 +371,8 @@ class ExchangeRate(Base):
     __tablename__ = "exchange_rates"
     
     # Currency pair
-    from_currency: Mapped[Currency] = mapped_column(Enum(Currency))
-    to_currency: Mapped[Currency] = mapped_column(Enum(Currency))
+    from_currency: Mapped[Currency] = mapped_column(_string_enum(Currency))
+    to_currency: Mapped[Currency] = mapped_column(_string_enum(Currency))
     
     # Rate data
     rate_date: Mapped[datetime] = mapped_column(DateTime(timezone=True))
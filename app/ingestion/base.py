@@ -1,16 +1,21 @@
 from abc import ABC, abstractmethod
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, FrozenSet
 from datetime import datetime
 from decimal import Decimal
+import os
 import structlog
 from dataclasses import dataclass
 
 from app.db.models import TransactionType, Currency
 
 
-@dataclass
+@dataclass(slots=True)
 class ParsedTransaction:
-    """Standardized transaction data from parsers"""
+    """Standardized transaction data from parsers
+    
+    Slotted: a statement can yield tens of thousands of these, and
+    ingestion reads their fields row by row.
+    """
     
     # Required fields first
     transaction_type: TransactionType
@@ -38,13 +43,17 @@ class ParsedTransaction:
     def __post_init__(self):
         """Calculate net amount if not provided"""
         if self.net_amount is None:
-            if self.transaction_type == TransactionType.BUY:
-                self.net_amount = self.gross_amount + self.brokerage + self.taxes + self.other_charges
+            charges = self.brokerage + self.taxes + self.other_charges
+            if not charges:
+                # Most statement rows carry no charges; keep the gross Decimal as is
+                self.net_amount = self.gross_amount
+            elif self.transaction_type is TransactionType.BUY:
+                self.net_amount = self.gross_amount + charges
             else:  # SELL or others
-                self.net_amount = self.gross_amount - self.brokerage - self.taxes - self.other_charges
+                self.net_amount = self.gross_amount - charges
 
 
-@dataclass 
+@dataclass(slots=True)
 class ParsedHolding:
     """Standardized holding data from CAS statements"""
     
@@ -67,6 +76,9 @@ class ParsedHolding:
 class BaseParser(ABC):
     """Base class for all file parsers"""
     
+    # File kinds (see ParserFactory.sniff_file_kind) this parser reads; empty means any
+    file_kinds: FrozenSet[str] = frozenset()
+    
     def __init__(self):
         self.logger = structlog.get_logger(self.__class__.__name__)
     
@@ -86,19 +98,35 @@ class BaseParser(ABC):
     
     def validate_transaction(self, transaction: ParsedTransaction) -> bool:
         """Validate a parsed transaction"""
+        # Valid rows are the common case: one combined check, no logging work
+        if transaction.instrument_name and transaction.quantity > 0 and transaction.price > 0:
+            return True
+        
+        self._warn_invalid(transaction)
+        return False
+    
+    def _warn_invalid(self, transaction: ParsedTransaction) -> None:
         if not transaction.instrument_name:
             self.logger.warning("Transaction missing instrument name", transaction=transaction)
-            return False
-        
-        if transaction.quantity <= 0:
+        elif transaction.quantity <= 0:
             self.logger.warning("Invalid quantity", quantity=transaction.quantity)
-            return False
-        
-        if transaction.price <= 0:
+        else:
             self.logger.warning("Invalid price", price=transaction.price)
-            return False
-        
-        return True
+
+
+# Leading bytes identifying a file kind regardless of its name
+_MAGIC_FILE_KINDS = (
+    (b"%PDF-", "pdf"),
+    (b"PK\x03\x04", "xlsx"),
+)
+
+_EXTENSION_FILE_KINDS = {
+    ".pdf": "pdf",
+    ".csv": "csv",
+    ".xlsx": "xlsx",
+    ".xls": "xls",
+    ".txt": "text",
+}
 
 
 class ParserFactory:
@@ -106,16 +134,41 @@ class ParserFactory:
     
     def __init__(self):
         self._parsers = []
+        # Parsers to try per file kind, in registration order; parsers without
+        # declared kinds are in every list
+        self._by_kind: Dict[Optional[str], List[BaseParser]] = {}
+        self._any_kind: List[BaseParser] = []
         self.logger = structlog.get_logger("ParserFactory")
     
     def register_parser(self, parser: BaseParser):
         """Register a new parser"""
         self._parsers.append(parser)
+        
+        if parser.file_kinds:
+            for kind in parser.file_kinds:
+                self._by_kind.setdefault(kind, list(self._any_kind)).append(parser)
+        else:
+            self._any_kind.append(parser)
+            for candidates in self._by_kind.values():
+                candidates.append(parser)
+        
         self.logger.info("Registered parser", parser_class=parser.__class__.__name__)
     
+    @staticmethod
+    def sniff_file_kind(file_content: bytes, filename: str) -> Optional[str]:
+        """Identify a file's kind from its magic bytes, falling back to its extension"""
+        for magic, kind in _MAGIC_FILE_KINDS:
+            if file_content.startswith(magic):
+                return kind
+        
+        return _EXTENSION_FILE_KINDS.get(os.path.splitext(filename)[1].lower())
+    
     def get_parser(self, file_content: bytes, filename: str) -> Optional[BaseParser]:
         """Get appropriate parser for file"""
-        for parser in self._parsers:
+        kind = self.sniff_file_kind(file_content, filename)
+        
+        # Only parsers for this kind of file get to inspect its content
+        for parser in self._by_kind.get(kind, self._any_kind):
             if parser.can_parse(file_content, filename):
                 self.logger.info("Found parser", parser_class=parser.__class__.__name__, filename=filename)
                 return parser
@@ -2,50 +2,75 @@ import re
 from typing import List, Dict, Any, Optional
 from datetime import datetime
 from decimal import Decimal
-import PyPDF2
-import io
 
+from app.ingestion.dates import parse_day_first_date
+from app.ingestion.pdf import extract_text
 from app.ingestion.base import BaseParser, ParsedTransaction, ParsedHolding, parser_factory
 from app.db.models import TransactionType, Currency
 
 
+# Compiled once at import and shared by every parser instance
+_PATTERNS = {
+    'cas_title': re.compile(r'CONSOLIDATED ACCOUNT STATEMENT|CAS', re.IGNORECASE),
+    'cams_signature': re.compile(r'CAMS|Computer Age Management Services', re.IGNORECASE),
+    'kfin_signature': re.compile(r'KFintech|Karvy Fintech', re.IGNORECASE),
+    'statement_period': re.compile(r'Statement Period[\s:]+(\d{2}[/-]\d{2}[/-]\d{4}) to (\d{2}[/-]\d{2}[/-]\d{4})'),
+    'investor_info': re.compile(r'PAN[\s:]+([A-Z]{5}[0-9]{4}[A-Z]{1})'),
+    # Folio anchors and per-folio fields, labelled by named group in one scan.
+    # The scheme name is captured inside a lookahead so identifiers on the
+    # same line are still visited.
+    'folio_fields': re.compile(
+        r'(?i:Folio No[\s:]+(?P<folio>[A-Z0-9/]+))'
+        r'|(?i:Scheme[\s:]+(?=(?P<scheme>.+?)(?=\n|Advisor)))'
+        r'|AMFI[\s:]+(?P<amfi>[0-9]+)'
+        r'|ISIN[\s:]+(?P<isin>[A-Z]{2}[A-Z0-9]{10})'
+    ),
+    'registrar': re.compile(r'Registrar[\s:]+(.+?)(?=\n)', re.IGNORECASE),
+
+    # Transaction patterns
+    'transaction_line': re.compile(
+        r'(\d{2}[/-]\d{2}[/-]\d{4})\s+'  # Date
+        r'(.+?)\s+'  # Transaction description
+        r'([\d,.-]+)\s+'  # Amount
+        r'([\d,.-]+)\s+'  # Units
+        r'([\d,.-]+)\s+'  # Price/NAV
+        r'([\d,.-]+)'  # Balance units
+        , re.MULTILINE
+    ),
+
+    # Holding patterns
+    'current_value': re.compile(
+        r'Closing Unit Balance[\s:]+?([\d,.-]+)\s+'
+        r'NAV on (\d{2}[/-]\d{2}[/-]\d{4})[\s:]+?([\d,.-]+)\s+'
+        r'Value on \d{2}[/-]\d{2}[/-]\d{4}[\s:]+?([\d,.-]+)'
+        , re.MULTILINE
+    ),
+
+}
+
+# Named group in 'folio_fields' -> folio dict key
+_FOLIO_FIELD_KEYS = {'scheme': 'scheme_name', 'amfi': 'amfi_code', 'isin': 'isin'}
+
+# Keyword classes checked in priority order against the lowercased
+# description, so "dividend reinvestment" stays a buy
+_TRANSACTION_KEYWORDS = (
+    (re.compile(r'purchase|investment|sip|lumpsum'), TransactionType.BUY),
+    (re.compile(r'redemption|withdrawal'), TransactionType.SELL),
+    (re.compile(r'dividend'), TransactionType.DIVIDEND),
+)
+
+_NUMBER_NOISE = re.compile(r'[,\s]')
+_ZERO = Decimal('0')
+
+
 class CASParser(BaseParser):
     """Parser for CAMS/KFin Consolidated Account Statement (CAS) PDFs"""
     
+    file_kinds = frozenset({"pdf"})
+    
     def __init__(self):
         super().__init__()
-        self.patterns = {
-            'cas_title': re.compile(r'CONSOLIDATED ACCOUNT STATEMENT|CAS', re.IGNORECASE),
-            'cams_signature': re.compile(r'CAMS|Computer Age Management Services', re.IGNORECASE),
-            'kfin_signature': re.compile(r'KFintech|Karvy Fintech', re.IGNORECASE),
-            'statement_period': re.compile(r'Statement Period[\s:]+(\d{2}[/-]\d{2}[/-]\d{4}) to (\d{2}[/-]\d{2}[/-]\d{4})'),
-            'investor_info': re.compile(r'PAN[\s:]+([A-Z]{5}[0-9]{4}[A-Z]{1})'),
-            'folio_section': re.compile(r'Folio No[\s:]+([A-Z0-9/]+)', re.IGNORECASE),
-            'scheme_name': re.compile(r'Scheme[\s:]+(.+?)(?=\n|Advisor)', re.IGNORECASE),
-            'registrar': re.compile(r'Registrar[\s:]+(.+?)(?=\n)', re.IGNORECASE),
-            
-            # Transaction patterns
-            'transaction_line': re.compile(
-                r'(\d{2}[/-]\d{2}[/-]\d{4})\s+'  # Date
-                r'(.+?)\s+'  # Transaction description
-                r'([\d,.-]+)\s+'  # Amount
-                r'([\d,.-]+)\s+'  # Units
-                r'([\d,.-]+)\s+'  # Price/NAV
-                r'([\d,.-]+)'  # Balance units
-                , re.MULTILINE
-            ),
-            
-            # Holding patterns
-            'current_value': re.compile(
-                r'Closing Unit Balance[\s:]+?([\d,.-]+)\s+'
-                r'NAV on (\d{2}[/-]\d{2}[/-]\d{4})[\s:]+?([\d,.-]+)\s+'
-                r'Value on \d{2}[/-]\d{2}[/-]\d{4}[\s:]+?([\d,.-]+)'
-                , re.MULTILINE
-            ),
-            
-            'amfi_code': re.compile(r'AMFI[\s:]+([0-9]+)'),
-            'isin': re.compile(r'ISIN[\s:]+([A-Z]{2}[A-Z0-9]{10})'),
-        }
+        self.patterns = _PATTERNS
     
     def can_parse(self, file_content: bytes, filename: str) -> bool:
         """Check if this is a CAMS/KFin CAS PDF"""
@@ -127,20 +152,7 @@ class CASParser(BaseParser):
     
     def _extract_pdf_text(self, file_content: bytes) -> str:
         """Extract text from PDF content"""
-        text = ""
-        pdf_file = io.BytesIO(file_content)
-        
-        try:
-            reader = PyPDF2.PdfReader(pdf_file)
-            
-            for page in reader.pages:
-                text += page.extract_text() + "\n"
-                
-        except Exception as e:
-            self.logger.error("Error extracting PDF text", error=str(e))
-            raise
-        
-        return text
+        return extract_text(file_content)
     
     def _extract_statement_period(self, text: str) -> Optional[tuple]:
         """Extract statement period from CAS"""
@@ -159,35 +171,33 @@ class CASParser(BaseParser):
     def _split_into_folios(self, text: str) -> List[Dict[str, Any]]:
         """Split CAS text into individual folio sections"""
         folios = []
+        current = None
         
-        # Find all folio sections
-        folio_matches = list(self.patterns['folio_section'].finditer(text))
+        # Single pass: each folio anchor opens a section, and the first scheme,
+        # AMFI code and ISIN seen before the next anchor belong to it
+        for match in self.patterns['folio_fields'].finditer(text):
+            kind = match.lastgroup
+            if kind == 'folio':
+                if current is not None:
+                    current['text'] = text[current.pop('start'):match.start()]
+                current = {
+                    'folio_number': match.group('folio'),
+                    'scheme_name': None,
+                    'amfi_code': None,
+                    'isin': None,
+                    'start': match.start(),
+                }
+                folios.append(current)
+            elif current is not None:
+                key = _FOLIO_FIELD_KEYS[kind]
+                if current[key] is None:
+                    current[key] = match.group(kind)
         
-        for i, match in enumerate(folio_matches):
-            start_pos = match.start()
-            end_pos = folio_matches[i + 1].start() if i + 1 < len(folio_matches) else len(text)
-            
-            folio_text = text[start_pos:end_pos]
-            folio_number = match.group(1)
-            
-            # Extract scheme info
-            scheme_match = self.patterns['scheme_name'].search(folio_text)
-            scheme_name = scheme_match.group(1).strip() if scheme_match else "Unknown Scheme"
-            
-            # Extract AMFI code and ISIN
-            amfi_match = self.patterns['amfi_code'].search(folio_text)
-            amfi_code = amfi_match.group(1) if amfi_match else None
-            
-            isin_match = self.patterns['isin'].search(folio_text)
-            isin = isin_match.group(1) if isin_match else None
-            
-            folios.append({
-                'folio_number': folio_number,
-                'scheme_name': scheme_name,
-                'amfi_code': amfi_code,
-                'isin': isin,
-                'text': folio_text
-            })
+        if current is not None:
+            current['text'] = text[current.pop('start'):]
+        
+        for folio in folios:
+            folio['scheme_name'] = folio['scheme_name'].strip() if folio['scheme_name'] else "Unknown Scheme"
         
         return folios
     
@@ -282,33 +292,23 @@ class CASParser(BaseParser):
         """Determine transaction type from description"""
         desc_lower = description.lower()
         
-        if any(word in desc_lower for word in ['purchase', 'investment', 'sip', 'lumpsum']):
-            return TransactionType.BUY
-        elif any(word in desc_lower for word in ['redemption', 'withdrawal']):
-            return TransactionType.SELL
-        elif 'dividend' in desc_lower:
-            return TransactionType.DIVIDEND
-        else:
-            # Default to buy for mutual funds
-            return TransactionType.BUY
+        for keywords, txn_type in _TRANSACTION_KEYWORDS:
+            if keywords.search(desc_lower):
+                return txn_type
+        
+        # Default to buy for mutual funds
+        return TransactionType.BUY
     
     def _parse_date(self, date_str: str) -> datetime:
         """Parse date string with multiple formats"""
-        for fmt in ['%d/%m/%Y', '%d-%m-%Y', '%d/%m/%y', '%d-%m-%y']:
-            try:
-                return datetime.strptime(date_str, fmt)
-            except ValueError:
-                continue
-        
-        raise ValueError(f"Could not parse date: {date_str}")
+        return parse_day_first_date(date_str)
     
     def _parse_decimal(self, value: str) -> Decimal:
         """Parse decimal value from string, handling Indian number format"""
-        if not value or value.strip() == "":
-            return Decimal('0')
-        
-        # Remove commas and spaces, handle negative values
-        clean_value = re.sub(r'[,\s]', '', value.strip())
+        # Remove commas and spaces
+        clean_value = _NUMBER_NOISE.sub('', value) if value else ''
+        if not clean_value:
+            return _ZERO
         
         # Handle parentheses as negative (common in financial statements)
         if clean_value.startswith('(') and clean_value.endswith(')'):
@@ -318,7 +318,7 @@ class CASParser(BaseParser):
             return Decimal(clean_value)
         except Exception:
             self.logger.warning("Could not parse decimal value", value=value)
-            return Decimal('0')
+            return _ZERO
 
 
 # Register the parser
@@ -0,0 +1,24 @@
+import re
+from datetime import datetime
+
+
+# d/m/yyyy, d-m-yyyy, d/m/yy or d-m-yy (day and month one or two digits)
+# with a consistent separator
+_DAY_FIRST_DATE = re.compile(r'(\d{1,2})([/-])(\d{1,2})\2(\d{4}|\d{2})')
+
+
+def parse_day_first_date(date_str: str) -> datetime:
+    """Parse a day-first statement date without going through strptime
+
+    Two-digit years follow strptime's %y pivot (69-99 -> 1900s, 00-68 -> 2000s).
+    """
+    match = _DAY_FIRST_DATE.fullmatch(date_str)
+    if not match:
+        raise ValueError(f"Could not parse date: {date_str}")
+
+    day, _, month, year = match.groups()
+    year_value = int(year)
+    if len(year) == 2:
+        year_value += 1900 if year_value >= 69 else 2000
+
+    return datetime(year_value, int(month), int(day))
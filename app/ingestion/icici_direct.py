@@ -2,37 +2,47 @@ import re
 from typing import List, Dict, Any, Optional
 from datetime import datetime
 from decimal import Decimal
-import PyPDF2
-import io
 
+from app.ingestion.dates import parse_day_first_date
+from app.ingestion.pdf import extract_text
 from app.ingestion.base import BaseParser, ParsedTransaction, parser_factory
 from app.db.models import TransactionType, Currency
 
 
+# Compiled once at import and shared by every parser instance
+_PATTERNS = {
+    'contract_note': re.compile(r'CONTRACT NOTE', re.IGNORECASE),
+    'icici_direct': re.compile(r'ICICI DIRECT|ICICI Securities', re.IGNORECASE),
+    'trade_date': re.compile(r'Trade Date[\s:]+(\d{2}[/-]\d{2}[/-]\d{4})'),
+    'settlement_date': re.compile(r'Settlement Date[\s:]+(\d{2}[/-]\d{2}[/-]\d{4})'),
+    'client_code': re.compile(r'Client Code[\s:]+([A-Z0-9]+)'),
+    'transaction_table': re.compile(
+        r'(BUY|SELL)\s+'  # Transaction type
+        r'([A-Z0-9&\s]+?)\s+'  # Stock name
+        r'(\d+)\s+'  # Quantity
+        r'([\d.,]+)\s+'  # Rate
+        r'([\d.,]+)\s+'  # Gross Amount
+        r'([\d.,]+)\s+'  # Brokerage
+        r'([\d.,]+)\s+'  # Total
+        , re.MULTILINE | re.IGNORECASE
+    ),
+    'isin_mapping': re.compile(r'([A-Z0-9&\s]+?)\s+([A-Z]{2}[A-Z0-9]{10})', re.MULTILINE),
+    'exchange_info': re.compile(r'NSE|BSE', re.IGNORECASE),
+}
+
+_NUMBER_NOISE = re.compile(r'[,\s]')
+_ZERO = Decimal('0')
+_WHITESPACE_RUN = re.compile(r'\s+')
+
+
 class ICICIDirectParser(BaseParser):
     """Parser for ICICI Direct contract note PDFs"""
     
+    file_kinds = frozenset({"pdf"})
+    
     def __init__(self):
         super().__init__()
-        self.patterns = {
-            'contract_note': re.compile(r'CONTRACT NOTE', re.IGNORECASE),
-            'icici_direct': re.compile(r'ICICI DIRECT|ICICI Securities', re.IGNORECASE),
-            'trade_date': re.compile(r'Trade Date[\s:]+(\d{2}[/-]\d{2}[/-]\d{4})'),
-            'settlement_date': re.compile(r'Settlement Date[\s:]+(\d{2}[/-]\d{2}[/-]\d{4})'),
-            'client_code': re.compile(r'Client Code[\s:]+([A-Z0-9]+)'),
-            'transaction_table': re.compile(
-                r'(BUY|SELL)\s+'  # Transaction type
-                r'([A-Z0-9&\s]+?)\s+'  # Stock name
-                r'(\d+)\s+'  # Quantity
-                r'([\d.,]+)\s+'  # Rate
-                r'([\d.,]+)\s+'  # Gross Amount
-                r'([\d.,]+)\s+'  # Brokerage
-                r'([\d.,]+)\s+'  # Total
-                , re.MULTILINE | re.IGNORECASE
-            ),
-            'isin_mapping': re.compile(r'([A-Z0-9&\s]+?)\s+([A-Z]{2}[A-Z0-9]{10})', re.MULTILINE),
-            'exchange_info': re.compile(r'NSE|BSE', re.IGNORECASE),
-        }
+        self.patterns = _PATTERNS
     
     def can_parse(self, file_content: bytes, filename: str) -> bool:
         """Check if this is an ICICI Direct contract note"""
@@ -103,49 +113,30 @@ class ICICIDirectParser(BaseParser):
     
     def _extract_pdf_text(self, file_content: bytes) -> str:
         """Extract text from PDF content"""
-        text = ""
-        pdf_file = io.BytesIO(file_content)
-        
-        try:
-            reader = PyPDF2.PdfReader(pdf_file)
-            
-            for page in reader.pages:
-                text += page.extract_text() + "\n"
-                
-        except Exception as e:
-            self.logger.error("Error extracting PDF text", error=str(e))
-            raise
-        
-        return text
+        return extract_text(file_content)
     
     def _extract_trade_date(self, text: str) -> datetime:
         """Extract trade date from contract note"""
         match = self.patterns['trade_date'].search(text)
-        if match:
-            date_str = match.group(1)
-            # Handle different date formats
-            for fmt in ['%d/%m/%Y', '%d-%m-%Y', '%d/%m/%y', '%d-%m-%y']:
-                try:
-                    return datetime.strptime(date_str, fmt)
-                except ValueError:
-                    continue
+        trade_date = self._parse_date(match.group(1)) if match else None
+        if trade_date is None:
+            raise ValueError("Could not extract trade date")
         
-        raise ValueError("Could not extract trade date")
+        return trade_date
     
     def _extract_settlement_date(self, text: str) -> Optional[datetime]:
         """Extract settlement date from contract note"""
         match = self.patterns['settlement_date'].search(text)
-        if match:
-            date_str = match.group(1)
-            # Handle different date formats
-            for fmt in ['%d/%m/%Y', '%d-%m-%Y', '%d/%m/%y', '%d-%m-%y']:
-                try:
-                    return datetime.strptime(date_str, fmt)
-                except ValueError:
-                    continue
-        
         # If no settlement date found, return None
-        return None
+        return self._parse_date(match.group(1)) if match else None
+    
+    def _parse_date(self, date_str: str) -> Optional[datetime]:
+        """Parse a contract note date, or None if it is not a valid date"""
+        try:
+            return parse_day_first_date(date_str)
+        except ValueError:
+            # Matched the date pattern but is not a real date (e.g. 31/02)
+            return None
     
     def _extract_client_code(self, text: str) -> str:
         """Extract client code from contract note"""
@@ -159,7 +150,7 @@ class ICICIDirectParser(BaseParser):
         matches = self.patterns['isin_mapping'].findall(text)
         for instrument_name, isin in matches:
             # Clean up instrument name
-            clean_name = re.sub(r'\s+', ' ', instrument_name.strip())
+            clean_name = _WHITESPACE_RUN.sub(' ', instrument_name.strip())
             mappings[clean_name] = isin
         
         return mappings
@@ -199,7 +190,7 @@ class ICICIDirectParser(BaseParser):
         txn_type = TransactionType.BUY if raw_txn['type'] == 'BUY' else TransactionType.SELL
         
         # Clean and normalize instrument name
-        instrument_name = re.sub(r'\s+', ' ', raw_txn['instrument_name'].strip())
+        instrument_name = _WHITESPACE_RUN.sub(' ', raw_txn['instrument_name'].strip())
         
         # Get ISIN if available
         isin = isin_mappings.get(instrument_name)
@@ -235,17 +226,16 @@ class ICICIDirectParser(BaseParser):
     
     def _parse_decimal(self, value: str) -> Decimal:
         """Parse decimal value from string, handling Indian number format"""
-        if not value or value.strip() == "":
-            return Decimal('0')
-        
         # Remove commas and spaces
-        clean_value = re.sub(r'[,\s]', '', value.strip())
+        clean_value = _NUMBER_NOISE.sub('', value) if value else ''
+        if not clean_value:
+            return _ZERO
         
         try:
             return Decimal(clean_value)
         except Exception:
             self.logger.warning("Could not parse decimal value", value=value)
-            return Decimal('0')
+            return _ZERO
 
 
 # Register the parser
@@ -0,0 +1,70 @@
+import hashlib
+import io
+import threading
+import structlog
+import PyPDF2
+from cachetools import TTLCache
+
+from app.core.config import settings
+
+try:
+    import pymupdf  # roughly an order of magnitude faster text extraction
+except ImportError:
+    try:
+        import fitz as pymupdf  # PyMuPDF releases before 1.24.3
+    except ImportError:
+        pymupdf = None
+
+
+logger = structlog.get_logger("pdf")
+
+# can_parse, parse_transactions and parse_holdings each need the same text,
+# so keep recent documents' text keyed by a digest of their bytes. The text
+# carries PAN, folio numbers and holdings, so it expires shortly after the
+# upload that needed it. Uploads are parsed in worker threads, hence the lock.
+_text_cache: TTLCache = TTLCache(maxsize=32, ttl=60)
+_text_cache_lock = threading.Lock()
+
+
+def extract_text(file_content: bytes) -> str:
+    """Extract text from PDF content, one block per page"""
+    digest = hashlib.blake2b(file_content, digest_size=16).digest()
+    
+    with _text_cache_lock:
+        text = _text_cache.get(digest)
+    if text is not None:
+        return text
+    
+    text = _extract_text(file_content)
+    
+    with _text_cache_lock:
+        _text_cache[digest] = text
+    return text
+
+
+def _extract_text(file_content: bytes) -> str:
+    try:
+        # PyMuPDF is opt-in: its line layout differs from PyPDF2's on some
+        # documents, and the parsers' regexes were written against PyPDF2
+        if settings.PDF_TEXT_BACKEND == "pymupdf" and pymupdf is not None:
+            return _extract_with_pymupdf(file_content)
+        return _extract_with_pypdf2(file_content)
+        
+    except Exception as e:
+        logger.error("Error extracting PDF text", error=str(e))
+        raise
+
+
+def _extract_with_pymupdf(file_content: bytes) -> str:
+    document = pymupdf.open(stream=file_content, filetype="pdf")
+    try:
+        return "".join(page.get_text("text") + "\n" for page in document)
+    finally:
+        # Frees MuPDF's native buffers straight away
+        document.close()
+
+
+def _extract_with_pypdf2(file_content: bytes) -> str:
+    reader = PyPDF2.PdfReader(io.BytesIO(file_content))
+    parts = [(page.extract_text() or "") + "\n" for page in reader.pages]
+    return "".join(parts)
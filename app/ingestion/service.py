@@ -1,21 +1,53 @@
 from typing import List, Optional, Dict, Any
+from dataclasses import dataclass, field
 from datetime import datetime
 import structlog
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import text
 
-from app.ingestion.base import ParsedTransaction, ParsedHolding, parser_factory
+from app.ingestion.base import BaseParser, ParsedTransaction, ParsedHolding, parser_factory
 from app.ingestion.manual_assets import ManualAssetEntry, manual_asset_processor
 from app.db.models import FileUpload, Transaction, User, Portfolio, Instrument
 from app.core.database import get_db
 
 
+@dataclass
+class ParsedFile:
+    """Parser output for one file, produced before anything touches the database"""
+    parser: Optional[BaseParser] = None
+    transactions: List[ParsedTransaction] = field(default_factory=list)
+    holdings: List[ParsedHolding] = field(default_factory=list)
+    error: Optional[Exception] = None
+
+
 class IngestionService:
     """Service for processing file uploads and manual entries"""
     
     def __init__(self):
         self.logger = structlog.get_logger("IngestionService")
     
+    def parse_file(self, file_content: bytes, filename: str) -> ParsedFile:
+        """Detect the parser and parse a file without database access
+        
+        Safe to run in a worker thread; failures are captured on the result
+        so process_file_upload can record them against the upload.
+        """
+        parsed = ParsedFile()
+        
+        try:
+            parsed.parser = parser_factory.get_parser(file_content, filename)
+            
+            if parsed.parser:
+                parsed.transactions = parsed.parser.parse_transactions(file_content, filename)
+                
+                # Parse holdings if supported
+                if hasattr(parsed.parser, 'parse_holdings'):
+                    parsed.holdings = parsed.parser.parse_holdings(file_content, filename)
+        except Exception as e:
+            parsed.error = e
+        
+        return parsed
+    
     async def process_file_upload(
         self,
         db: AsyncSession,
@@ -23,10 +55,14 @@ class IngestionService:
         portfolio_id: str,
         file_content: bytes,
         filename: str,
-        file_type: str
+        file_type: str,
+        parsed: Optional[ParsedFile] = None
     ) -> Dict[str, Any]:
         """Process uploaded file and extract transactions"""
         
+        if parsed is None:
+            parsed = self.parse_file(file_content, filename)
+        
         # Create file upload record
         file_upload = FileUpload(
             user_id=user_id,
@@ -42,10 +78,9 @@ class IngestionService:
         await db.flush()
         
         try:
-            # Find appropriate parser
-            parser = parser_factory.get_parser(file_content, filename)
+            parser = parsed.parser
             
-            if not parser:
+            if not parser and parsed.error is None:
                 file_upload.status = "failed"
                 file_upload.errors = ["No suitable parser found for this file type"]
                 await db.commit()
@@ -57,16 +92,15 @@ class IngestionService:
                 }
             
             # Determine source type based on parser
-            source_type = self._get_source_type(parser)
-            file_upload.source_type = source_type
+            if parser:
+                source_type = self._get_source_type(parser)
+                file_upload.source_type = source_type
             
-            # Parse transactions
-            parsed_transactions = parser.parse_transactions(file_content, filename)
+            if parsed.error is not None:
+                raise parsed.error
             
-            # Parse holdings if supported
-            parsed_holdings = []
-            if hasattr(parser, 'parse_holdings'):
-                parsed_holdings = parser.parse_holdings(file_content, filename)
+            parsed_transactions = parsed.transactions
+            parsed_holdings = parsed.holdings
             
             # Convert and save transactions
             saved_transactions = []
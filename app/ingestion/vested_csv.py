@@ -11,6 +11,8 @@ from app.db.models import TransactionType, Currency
 class VestedCSVParser(BaseParser):
     """Parser for Vested US equities CSV exports"""
     
+    file_kinds = frozenset({"csv"})
+    
     def __init__(self):
         super().__init__()
         
@@ -2,10 +2,12 @@ from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.middleware.trustedhost import TrustedHostMiddleware
 from contextlib import asynccontextmanager
+import anyio
 import structlog
 
 from app.core.config import settings
 from app.core.database import init_db
+from app.core.cache import response_cache
 from app.core.logging import setup_logging
 from app.api.api import api_router
 from app.core.middleware import AuditLogMiddleware, SecurityHeadersMiddleware
@@ -20,6 +22,9 @@ async def lifespan(app: FastAPI):
     
     logger.info("Starting Reaum application", version=settings.APP_VERSION)
     
+    # Worker threads for password hashing and other blocking calls
+    anyio.to_thread.current_default_thread_limiter().total_tokens = settings.THREADPOOL_MAX_WORKERS
+    
     # Initialize database
     await init_db()
     logger.info("Database initialized")
@@ -27,6 +32,7 @@ async def lifespan(app: FastAPI):
     yield
     
     # Shutdown
+    await response_cache.close()
     logger.info("Shutting down Reaum application")
 
 
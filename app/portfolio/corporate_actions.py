@@ -25,53 +25,41 @@ class CorporateActionProcessor:
         self.db = db
     
     async def process_action(self, action_id: str) -> bool:
-        """Process a corporate action"""
-        
-        try:
-            # Get corporate action with instrument
-            result = await self.db.execute(
-                select(CorporateAction)
-                .options(selectinload(CorporateAction.instrument))
-                .where(CorporateAction.id == action_id)
-            )
-            action = result.scalar_one_or_none()
-            
-            if not action:
-                raise ValueError(f"Corporate action {action_id} not found")
-            
-            if action.status != CorporateActionStatus.PENDING:
-                raise ValueError(f"Corporate action {action_id} is not in pending status")
-            
-            # Update status to processing
-            action.status = CorporateActionStatus.PROCESSING
-            await self.db.commit()
-            
-            # Process based on action type
-            if action.action_type == CorporateActionType.STOCK_SPLIT:
-                await self._process_stock_split(action)
-            elif action.action_type == CorporateActionType.BONUS:
-                await self._process_bonus_issue(action)
-            elif action.action_type == CorporateActionType.DIVIDEND:
-                await self._process_dividend(action)
-            else:
-                raise ValueError(f"Unsupported corporate action type: {action.action_type}")
-            
-            # Update status to completed
-            action.status = CorporateActionStatus.COMPLETED
-            await self.db.commit()
-            
-            logger.info("Corporate action processed successfully", action_id=action_id)
-            return True
-            
-        except Exception as e:
-            logger.error("Error processing corporate action", action_id=action_id, error=str(e))
-            
-            # Update status to failed
-            if action:
-                action.status = CorporateActionStatus.FAILED
-                await self.db.commit()
-            
-            raise e
+        """Process a corporate action
+        
+        All changes are left in the session's current transaction; the caller
+        commits (or rolls back) the whole action as a single unit.
+        """
+        
+        # Get corporate action with instrument
+        result = await self.db.execute(
+            select(CorporateAction)
+            .options(selectinload(CorporateAction.instrument))
+            .where(CorporateAction.id == action_id)
+        )
+        action = result.scalar_one_or_none()
+        
+        if not action:
+            raise ValueError(f"Corporate action {action_id} not found")
+        
+        # The API marks actions as processing before handing them off
+        if action.status not in (CorporateActionStatus.PENDING, CorporateActionStatus.PROCESSING):
+            raise ValueError(f"Corporate action {action_id} is not in pending status")
+        
+        # Process based on action type
+        if action.action_type == CorporateActionType.STOCK_SPLIT:
+            await self._process_stock_split(action)
+        elif action.action_type == CorporateActionType.BONUS:
+            await self._process_bonus_issue(action)
+        elif action.action_type == CorporateActionType.DIVIDEND:
+            await self._process_dividend(action)
+        else:
+            raise ValueError(f"Unsupported corporate action type: {action.action_type}")
+        
+        action.status = CorporateActionStatus.COMPLETED
+        
+        logger.info("Corporate action processed successfully", action_id=action_id)
+        return True
     
     async def _process_stock_split(self, action: CorporateAction):
         """Process stock split - adjust quantities and prices"""
@@ -116,8 +104,6 @@ class CorporateActionProcessor:
         for tax_lot in tax_lots:
             tax_lot.quantity = tax_lot.quantity * split_ratio
             tax_lot.buy_price = tax_lot.buy_price / split_ratio
-            
-        await self.db.commit()
     
     async def _process_bonus_issue(self, action: CorporateAction):
         """Process bonus issue - add free shares"""
@@ -153,8 +139,6 @@ class CorporateActionProcessor:
                 bonus_qty=float(bonus_shares),
                 new_total=float(new_total_quantity)
             )
-        
-        await self.db.commit()
     
     async def _process_dividend(self, action: CorporateAction):
         """Process dividend - create cash transactions"""
@@ -196,5 +180,3 @@ class CorporateActionProcessor:
                 dividend_per_share=float(action.cash_amount),
                 total_dividend=float(dividend_amount)
             )
-        
-        await self.db.commit()
\ No newline at end of file
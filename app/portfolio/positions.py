@@ -22,7 +22,7 @@ class TaxLotMethod(str, Enum):
     SPEC_ID = "spec_id"  # Specific Identification
 
 
-@dataclass
+@dataclass(slots=True)
 class PositionSnapshot:
     """Snapshot of a position at a point in time"""
     instrument_id: str
@@ -43,7 +43,7 @@ class PositionSnapshot:
             self.tax_lots = []
 
 
-@dataclass
+@dataclass(slots=True)
 class TaxLotSnapshot:
     """Snapshot of a tax lot"""
     acquisition_date: datetime
@@ -55,7 +55,7 @@ class TaxLotSnapshot:
     days_held: int
 
 
-@dataclass
+@dataclass(slots=True)
 class RealizedGain:
     """Realized gain/loss from a sale"""
     instrument_id: str
@@ -133,7 +133,7 @@ class TaxLotManager:
         # Add to existing lots
         updated_lots = existing_lots + [new_lot]
         
-        self.logger.info(
+        self.logger.debug(
             "Created new tax lot",
             transaction_id=transaction.id,
             quantity=str(transaction.quantity),
@@ -226,7 +226,7 @@ class TaxLotManager:
             acquisition_lots=acquisition_lots
         )
         
-        self.logger.info(
+        self.logger.debug(
             "Processed sale transaction",
             transaction_id=transaction.id,
             sale_quantity=str(sale_quantity),
@@ -378,7 +378,7 @@ class PositionCalculator:
             tax_lots=tax_lot_snapshots
         )
         
-        self.logger.info(
+        self.logger.debug(
             "Calculated position",
             instrument_id=instrument_id,
             quantity=str(total_quantity),
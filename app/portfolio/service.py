@@ -1,8 +1,8 @@
-from typing import List, Dict, Optional, Tuple
+from typing import List, Dict, Optional, Tuple, Any, Set
 from datetime import datetime, timezone
 from decimal import Decimal
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, and_
+from sqlalchemy import select, and_, func
 import structlog
 
 from app.portfolio.positions import PositionCalculator, PositionSnapshot, TaxLotManager
@@ -51,31 +51,14 @@ class PortfolioService:
                 transactions_by_instrument[txn.instrument_id] = []
             transactions_by_instrument[txn.instrument_id].append(txn)
         
-        positions = []
+        # Prices for every instrument come from one query instead of one per position
+        current_prices = await self._get_current_prices(
+            db, set(transactions_by_instrument), valuation_date
+        )
         
-        for instrument_id, instrument_transactions in transactions_by_instrument.items():
-            try:
-                # Get current price
-                current_price = await self._get_current_price(db, instrument_id, valuation_date)
-                
-                # Calculate position
-                position = self.position_calculator.calculate_position(
-                    transactions=instrument_transactions,
-                    current_price=current_price,
-                    valuation_date=valuation_date
-                )
-                
-                # Only include positions with quantity > 0
-                if position.quantity > 0:
-                    positions.append(position)
-                    
-            except Exception as e:
-                self.logger.error(
-                    "Error calculating position", 
-                    instrument_id=instrument_id, 
-                    error=str(e)
-                )
-                continue
+        positions = self._build_open_positions(
+            transactions_by_instrument, current_prices, valuation_date, portfolio_id=portfolio_id
+        )
         
         self.logger.info(
             "Calculated portfolio positions",
@@ -247,6 +230,7 @@ class PortfolioService:
         summary = {
             'portfolio_id': portfolio_id,
             'portfolio_name': portfolio.name,
+            'description': portfolio.description,
             'base_currency': portfolio.base_currency,
             'valuation_date': valuation_date.isoformat(),
             
@@ -263,7 +247,7 @@ class PortfolioService:
             
             # Holdings
             'total_positions': len(positions),
-            'positions': [self._position_to_dict(pos) for pos in positions],
+            'positions': [self.position_to_dict(pos) for pos in positions],
             
             # Allocations
             'asset_allocation': asset_allocation,
@@ -272,6 +256,158 @@ class PortfolioService:
         
         return summary
     
+    async def get_summaries_for_user(
+        self,
+        db: AsyncSession,
+        user_id: str,
+        valuation_date: Optional[datetime] = None
+    ) -> Tuple[List[Dict[str, Any]], Dict[str, Any]]:
+        """Get lightweight summaries for all of a user's portfolios, plus totals across them, in a fixed number of queries"""
+        
+        valuation_date = valuation_date or datetime.now(timezone.utc)
+        
+        portfolios_result = await db.execute(
+            select(Portfolio.id, Portfolio.name)
+            .where(Portfolio.user_id == user_id)
+            .order_by(Portfolio.created_at)
+        )
+        portfolios = portfolios_result.all()
+        
+        totals_by_portfolio = await self._calculate_portfolio_totals(
+            db, [portfolio.id for portfolio in portfolios], valuation_date
+        )
+        
+        summaries = []
+        grand_invested = grand_value = grand_unrealized_pnl = Decimal('0')
+        
+        for portfolio in portfolios:
+            invested, market_value, unrealized_pnl, position_count = totals_by_portfolio[portfolio.id]
+            
+            summaries.append({
+                'portfolio_id': portfolio.id,
+                'portfolio_name': portfolio.name,
+                **self._summary_totals(invested, market_value, unrealized_pnl),
+                'total_positions': position_count,
+            })
+            
+            grand_invested += invested
+            grand_value += market_value
+            grand_unrealized_pnl += unrealized_pnl
+        
+        return summaries, self._summary_totals(grand_invested, grand_value, grand_unrealized_pnl)
+    
+    async def get_portfolio_summaries_bulk(
+        self,
+        db: AsyncSession,
+        portfolio_ids: List[str],
+        valuation_date: Optional[datetime] = None
+    ) -> Dict[str, Dict[str, Any]]:
+        """Get lightweight summaries for several portfolios in a fixed number of queries, keyed by portfolio id"""
+        
+        valuation_date = valuation_date or datetime.now(timezone.utc)
+        totals_by_portfolio = await self._calculate_portfolio_totals(db, portfolio_ids, valuation_date)
+        
+        return {
+            portfolio_id: {
+                **self._summary_totals(invested, market_value, unrealized_pnl),
+                'total_positions': position_count,
+                'valuation_date': valuation_date.isoformat(),
+            }
+            for portfolio_id, (invested, market_value, unrealized_pnl, position_count) in totals_by_portfolio.items()
+        }
+    
+    async def _calculate_portfolio_totals(
+        self,
+        db: AsyncSession,
+        portfolio_ids: List[str],
+        valuation_date: datetime
+    ) -> Dict[str, Tuple[Decimal, Decimal, Decimal, int]]:
+        """Invested, market value, unrealized P&L and open position count per portfolio"""
+        
+        totals: Dict[str, Tuple[Decimal, Decimal, Decimal, int]] = {
+            portfolio_id: (Decimal('0'), Decimal('0'), Decimal('0'), 0)
+            for portfolio_id in portfolio_ids
+        }
+        
+        if not portfolio_ids:
+            return totals
+        
+        # One query for every transaction across the portfolios
+        from sqlalchemy.orm import selectinload
+        stmt = (
+            select(Transaction)
+            .where(Transaction.portfolio_id.in_(portfolio_ids))
+            .options(selectinload(Transaction.instrument))
+            .order_by(Transaction.transaction_date)
+        )
+        result = await db.execute(stmt)
+        transactions = result.scalars().all()
+        
+        # Group transactions by portfolio, then by instrument
+        grouped: Dict[str, Dict[str, List[Transaction]]] = {}
+        for txn in transactions:
+            grouped.setdefault(txn.portfolio_id, {}).setdefault(txn.instrument_id, []).append(txn)
+        
+        instrument_ids = {txn.instrument_id for txn in transactions}
+        current_prices = await self._get_current_prices(db, instrument_ids, valuation_date)
+        
+        for portfolio_id, by_instrument in grouped.items():
+            positions = self._build_open_positions(
+                by_instrument, current_prices, valuation_date, portfolio_id=portfolio_id
+            )
+            
+            totals[portfolio_id] = (
+                sum((pos.total_cost for pos in positions), Decimal('0')),
+                sum((pos.market_value or Decimal('0') for pos in positions), Decimal('0')),
+                sum((pos.unrealized_pnl or Decimal('0') for pos in positions), Decimal('0')),
+                len(positions),
+            )
+        
+        return totals
+    
+    def _build_open_positions(
+        self,
+        transactions_by_instrument: Dict[str, List[Transaction]],
+        current_prices: Dict[str, Decimal],
+        valuation_date: datetime,
+        portfolio_id: str
+    ) -> List[PositionSnapshot]:
+        """Calculate one position per instrument, keeping only those still held"""
+        
+        positions = []
+        
+        for instrument_id, instrument_transactions in transactions_by_instrument.items():
+            try:
+                position = self.position_calculator.calculate_position(
+                    transactions=instrument_transactions,
+                    current_price=current_prices.get(instrument_id),
+                    valuation_date=valuation_date
+                )
+                
+                # Only include positions with quantity > 0
+                if position.quantity > 0:
+                    positions.append(position)
+                    
+            except Exception as e:
+                self.logger.error(
+                    "Error calculating position",
+                    portfolio_id=portfolio_id,
+                    instrument_id=instrument_id,
+                    error=str(e)
+                )
+                continue
+        
+        return positions
+    
+    @staticmethod
+    def _summary_totals(invested: Decimal, current_value: Decimal, unrealized_pnl: Decimal) -> Dict[str, Any]:
+        return {
+            'total_invested': float(invested),
+            'current_value': float(current_value),
+            'unrealized_pnl': float(unrealized_pnl),
+            'unrealized_pnl_percentage': float(unrealized_pnl / invested * 100) if invested > 0 else 0.0,
+        }
+    
     async def get_realized_gains(
         self,
         db: AsyncSession,
@@ -317,29 +453,42 @@ class PortfolioService:
         
         return gains
     
-    async def _get_current_price(
+    async def _get_current_prices(
         self,
         db: AsyncSession,
-        instrument_id: str,
+        instrument_ids: Set[str],
         valuation_date: datetime
-    ) -> Optional[Decimal]:
-        """Get current price for an instrument"""
+    ) -> Dict[str, Decimal]:
+        """Get the most recent price on or before valuation date for many instruments at once"""
+        
+        if not instrument_ids:
+            return {}
         
-        # Find the most recent price on or before valuation date
-        stmt = select(Price).where(
+        latest = (
+            select(
+                Price.instrument_id,
+                func.max(Price.price_date).label('price_date')
+            )
+            .where(
+                and_(
+                    Price.instrument_id.in_(instrument_ids),
+                    Price.price_date <= valuation_date
+                )
+            )
+            .group_by(Price.instrument_id)
+            .subquery()
+        )
+        
+        stmt = select(Price.instrument_id, Price.close_price).join(
+            latest,
             and_(
-                Price.instrument_id == instrument_id,
-                Price.price_date <= valuation_date
+                Price.instrument_id == latest.c.instrument_id,
+                Price.price_date == latest.c.price_date
             )
-        ).order_by(Price.price_date.desc()).limit(1)
+        )
         
         result = await db.execute(stmt)
-        price_record = result.scalar_one_or_none()
-        
-        if price_record:
-            return price_record.close_price
-        
-        return None
+        return {row.instrument_id: row.close_price for row in result}
     
     async def _calculate_asset_allocation(
         self,
@@ -396,23 +545,27 @@ class PortfolioService:
         
         return allocation
     
-    def _position_to_dict(self, position: PositionSnapshot) -> Dict:
+    @staticmethod
+    def position_to_dict(position: PositionSnapshot) -> Dict:
         """Convert position snapshot to dictionary"""
         
+        # Each Decimal is converted once and the percentage is derived from the floats
+        total_cost = float(position.total_cost)
+        unrealized_pnl = float(position.unrealized_pnl) if position.unrealized_pnl else None
+        
         return {
             'instrument_id': position.instrument_id,
             'instrument_name': position.instrument_name,
             'quantity': float(position.quantity),
             'average_cost': float(position.average_cost),
-            'total_cost': float(position.total_cost),
+            'total_cost': total_cost,
             'current_price': float(position.current_price) if position.current_price else None,
             'market_value': float(position.market_value) if position.market_value else None,
-            'unrealized_pnl': float(position.unrealized_pnl) if position.unrealized_pnl else None,
-            'unrealized_pnl_percentage': float(position.unrealized_pnl / position.total_cost * 100) if position.unrealized_pnl and position.total_cost > 0 else 0.0,
+            'unrealized_pnl': unrealized_pnl,
+            'unrealized_pnl_percentage': unrealized_pnl / total_cost * 100 if unrealized_pnl and total_cost > 0 else 0.0,
             'currency': position.currency.value,
             'tax_lots_count': len(position.tax_lots) if position.tax_lots else 0
         }
 
-
 # Create global service instance
 portfolio_service = PortfolioService()
\ No newline at end of file
@@ -1,7 +1,7 @@
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, and_
+from sqlalchemy import select, and_, insert
 from sqlalchemy.orm import selectinload
-from datetime import date, datetime, timedelta
+from datetime import date, timedelta
 from typing import List, Optional
 import structlog
 from decimal import Decimal
@@ -65,7 +65,7 @@ class PricingService:
                 prices = await provider.get_prices(provider_instruments, price_date)
                 
                 # Store prices in database
-                updated_count = await self._store_prices(prices, price_date)
+                updated_count = await self._store_prices(prices, price_date, provider.__class__.__name__)
                 total_updated += updated_count
                 
                 logger.info(
@@ -134,42 +134,45 @@ class PricingService:
         
         return result.scalars().all()
     
-    async def _store_prices(self, prices: dict, price_date: date) -> int:
+    async def _store_prices(self, prices: dict, price_date: date, source: str) -> int:
         """Store prices in database"""
         
-        updated_count = 0
+        if not prices:
+            return 0
         
-        for instrument_id, price_value in prices.items():
-            try:
-                # Check if price already exists for this date
-                existing_price = await self.get_price_on_date(instrument_id, price_date)
-                
-                if existing_price:
-                    # Update existing price
-                    existing_price.close_price = price_value
-                    existing_price.updated_at = datetime.now()
-                else:
-                    # Create new price record
-                    new_price = Price(
-                        instrument_id=instrument_id,
-                        price_date=price_date,
-                        close_price=price_value,
-                        currency="INR"  # Default currency, should be instrument-specific
-                    )
-                    self.db.add(new_price)
-                
-                updated_count += 1
-                
-            except Exception as e:
-                logger.error(
-                    "Error storing price",
-                    instrument_id=instrument_id,
-                    price=price_value,
-                    error=str(e)
+        # One query for the prices already stored for this date
+        result = await self.db.execute(
+            select(Price)
+            .where(
+                and_(
+                    Price.instrument_id.in_(list(prices)),
+                    Price.price_date == price_date
                 )
+            )
+        )
+        existing_prices = {price.instrument_id: price for price in result.scalars()}
+        
+        new_prices = []
+        for instrument_id, price_value in prices.items():
+            existing_price = existing_prices.get(instrument_id)
+            
+            if existing_price:
+                # Update existing price
+                existing_price.close_price = price_value
+            else:
+                new_prices.append({
+                    "instrument_id": instrument_id,
+                    "price_date": price_date,
+                    "close_price": price_value,
+                    "source": source,
+                })
+        
+        # Insert new prices as one batched executemany instead of a flush per ORM object
+        if new_prices:
+            await self.db.execute(insert(Price), new_prices)
         
         await self.db.commit()
-        return updated_count
+        return len(prices)
     
     async def backfill_missing_prices(self, days: int = 30) -> int:
         """Backfill missing prices for the last N days"""
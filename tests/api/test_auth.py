@@ -216,6 +216,31 @@ class TestUserLogin:
         data = response.json()
         assert data["detail"] == "Inactive user"
     
+    @pytest.mark.asyncio
+    async def test_login_upgrades_legacy_hash(
+        self,
+        client: AsyncClient,
+        db_session: AsyncSession,
+        sample_user: User
+    ):
+        """Test that a legacy SHA-256 hash is replaced with Argon2id on login."""
+        assert not sample_user.hashed_password.startswith("$argon2")
+
+        login_data = {
+            "email": sample_user.email,
+            "password": "testpass123"
+        }
+
+        response = await client.post("/api/v1/auth/login", json=login_data)
+        assert response.status_code == 200
+
+        await db_session.refresh(sample_user)
+        assert sample_user.hashed_password.startswith("$argon2id$")
+
+        # Login keeps working against the upgraded hash
+        response = await client.post("/api/v1/auth/login", json=login_data)
+        assert response.status_code == 200
+
     @pytest.mark.asyncio
     async def test_login_malformed_request(self, client: AsyncClient):
         """Test login with malformed JSON."""
@@ -270,6 +295,59 @@ class TestUserLogout:
         response = await client.post("/api/v1/auth/logout")
         assert response.status_code == 200
 
+    @pytest.mark.asyncio
+    async def test_logout_evicts_cached_token(self, authenticated_user, client: AsyncClient):
+        """Test that a verified token is cached and logout evicts it."""
+        from app.api.dependencies import _TOKEN_CACHE
+
+        headers = authenticated_user["headers"]
+        token = authenticated_user["token"]
+
+        response = await client.get("/api/v1/dashboard/", headers=headers)
+        assert response.status_code == 200
+        assert _TOKEN_CACHE[token].user.id == authenticated_user["user"].id
+
+        response = await client.post("/api/v1/auth/logout", headers=headers)
+        assert response.status_code == 200
+        assert token not in _TOKEN_CACHE
+
+    @pytest.mark.asyncio
+    async def test_logout_evicts_cached_user(self, authenticated_user, client: AsyncClient):
+        """Test that the user lookup is cached by email and logout evicts it."""
+        from app.api.dependencies import _USER_CACHE
+
+        headers = authenticated_user["headers"]
+        email = authenticated_user["user"].email
+
+        response = await client.get("/api/v1/dashboard/", headers=headers)
+        assert response.status_code == 200
+        assert _USER_CACHE[email].id == authenticated_user["user"].id
+
+        response = await client.post("/api/v1/auth/logout", headers=headers)
+        assert response.status_code == 200
+        assert email not in _USER_CACHE
+
+    @pytest.mark.asyncio
+    async def test_cached_user_survives_session_rollback(
+        self, authenticated_user, client: AsyncClient, db_session: AsyncSession
+    ):
+        """Test that cached users are detached snapshots, not session-bound ORM objects."""
+        from app.api.dependencies import _USER_CACHE, CurrentUser
+
+        headers = authenticated_user["headers"]
+        email = authenticated_user["user"].email
+
+        response = await client.get("/api/v1/dashboard/", headers=headers)
+        assert response.status_code == 200
+        assert isinstance(_USER_CACHE[email], CurrentUser)
+
+        # An error path rolls back and the session is discarded
+        await db_session.rollback()
+        db_session.expunge_all()
+
+        response = await client.get("/api/v1/dashboard/", headers=headers)
+        assert response.status_code == 200
+
 
 class TestAuthenticationFlow:
     """Test complete authentication workflows."""
@@ -306,6 +384,17 @@ class TestAuthenticationFlow:
         payload = jwt.decode(token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM])
         assert payload["sub"] == registration_data["email"]
     
+    @pytest.mark.asyncio
+    async def test_token_without_expiry_rejected(self, client: AsyncClient, sample_user: User):
+        """Test that a validly signed token without an exp claim is rejected."""
+        token = jwt.encode({"sub": sample_user.email}, settings.SECRET_KEY, algorithm=settings.ALGORITHM)
+        
+        response = await client.get(
+            "/api/v1/dashboard/", headers={"Authorization": f"Bearer {token}"}
+        )
+        
+        assert response.status_code == 401
+    
     @pytest.mark.asyncio
     async def test_password_hashing_security(self, client: AsyncClient, db_session: AsyncSession):
         """Test that passwords are properly hashed in database."""
@@ -0,0 +1,146 @@
+"""
+Corporate Actions API Tests
+
+Tests for listing corporate actions and their visibility rules.
+"""
+import pytest
+from httpx import AsyncClient
+from sqlalchemy.ext.asyncio import AsyncSession
+from datetime import date
+from decimal import Decimal
+
+from app.db.models import (
+    User, Instrument, CorporateAction, CorporateActionType, CorporateActionStatus
+)
+
+
+class TestListCorporateActions:
+    """Test corporate action listing endpoint."""
+    
+    @pytest.mark.asyncio
+    async def test_list_requires_authentication(self, client: AsyncClient):
+        """Test listing corporate actions without authentication."""
+        response = await client.get("/api/v1/corporate-actions/")
+        
+        assert response.status_code in [401, 403]
+    
+    @pytest.mark.asyncio
+    async def test_list_corporate_actions(
+        self,
+        authenticated_user,
+        client: AsyncClient,
+        db_session: AsyncSession,
+        sample_instruments: list[Instrument]
+    ):
+        """Test that own and approved actions are listed newest ex-date first."""
+        user = authenticated_user["user"]
+        instrument = sample_instruments[0]
+        
+        other_user = User(
+            email="corporate-actions-other@example.com",
+            hashed_password="x",
+            full_name="Other User",
+            is_active=True
+        )
+        db_session.add(other_user)
+        await db_session.commit()
+        
+        db_session.add_all([
+            CorporateAction(
+                instrument_id=instrument.id,
+                action_type=CorporateActionType.DIVIDEND,
+                status=CorporateActionStatus.PENDING,
+                ex_date=date(2024, 1, 10),
+                cash_amount=Decimal("5.5"),
+                created_by=user.id
+            ),
+            CorporateAction(
+                instrument_id=instrument.id,
+                action_type=CorporateActionType.STOCK_SPLIT,
+                status=CorporateActionStatus.APPROVED,
+                ex_date=date(2024, 3, 1),
+                ratio_old=Decimal("1"),
+                ratio_new=Decimal("2"),
+                created_by=other_user.id
+            ),
+            CorporateAction(
+                instrument_id=instrument.id,
+                action_type=CorporateActionType.BONUS,
+                status=CorporateActionStatus.PENDING,
+                ex_date=date(2024, 2, 1),
+                created_by=other_user.id
+            ),
+        ])
+        await db_session.commit()
+        
+        response = await client.get(
+            "/api/v1/corporate-actions/", headers=authenticated_user["headers"]
+        )
+        
+        assert response.status_code == 200
+        data = response.json()
+        
+        # Other users' pending actions are hidden
+        assert [item["action_type"] for item in data] == ["stock_split", "dividend"]
+        assert data[0]["instrument_id"] == instrument.id
+        assert data[0]["instrument_name"] is None
+        assert data[0]["status"] == "approved"
+        assert Decimal(data[1]["cash_amount"]) == Decimal("5.5")
+        
+        response = await client.get(
+            "/api/v1/corporate-actions/",
+            params={"include": "instrument"},
+            headers=authenticated_user["headers"]
+        )
+        
+        assert response.status_code == 200
+        assert [item["instrument_name"] for item in response.json()] == [instrument.name] * 2
+
+
+class TestCreateCorporateAction:
+    """Test corporate action creation endpoint."""
+    
+    @pytest.mark.asyncio
+    async def test_create_with_unknown_instrument(self, authenticated_user, client: AsyncClient):
+        """Test that a missing instrument surfaces as 404 rather than 500."""
+        response = await client.post(
+            "/api/v1/corporate-actions/",
+            json={
+                "instrument_id": "missing-instrument",
+                "action_type": "dividend",
+                "ex_date": "2024-01-10",
+                "cash_amount": "5.5"
+            },
+            headers=authenticated_user["headers"]
+        )
+        
+        assert response.status_code == 404
+        assert response.json()["detail"] == "Instrument not found"
+    
+    @pytest.mark.asyncio
+    async def test_create_corporate_action(
+        self,
+        authenticated_user,
+        client: AsyncClient,
+        sample_instruments: list[Instrument]
+    ):
+        """Test creating a pending corporate action."""
+        instrument = sample_instruments[0]
+        
+        response = await client.post(
+            "/api/v1/corporate-actions/",
+            json={
+                "instrument_id": instrument.id,
+                "action_type": "stock_split",
+                "ex_date": "2024-03-01",
+                "ratio_old": "1",
+                "ratio_new": "2"
+            },
+            headers=authenticated_user["headers"]
+        )
+        
+        assert response.status_code == 200
+        data = response.json()
+        assert data["instrument_name"] == instrument.name
+        assert data["action_type"] == "stock_split"
+        assert data["status"] == "pending"
@@ -189,6 +189,37 @@ class TestDashboardDataAccuracy:
                 for portfolio in data["portfolios"]:
                     assert portfolio.get("user_id") != other_user.id
 
+    @pytest.mark.asyncio
+    async def test_dashboard_values_positions_at_latest_price(
+        self,
+        authenticated_user,
+        client: AsyncClient,
+        sample_portfolio: Portfolio,
+        sample_instruments: list[Instrument],
+        sample_transactions: list[Transaction],
+        sample_prices
+    ):
+        """Test that market value uses the latest price of each held instrument."""
+        headers = authenticated_user["headers"]
+
+        response = await client.get("/api/v1/dashboard/", headers=headers)
+        assert response.status_code == 200
+
+        data = response.json()
+        assert len(data["portfolios"]) == 1
+
+        # sample_transactions leaves 50 units of the first and 200 of the second instrument
+        latest_prices = {price.instrument_id: price.close_price for price in sample_prices}
+        expected_value = (
+            Decimal("50") * latest_prices[sample_instruments[0].id]
+            + Decimal("200") * latest_prices[sample_instruments[1].id]
+        )
+
+        portfolio_data = data["portfolios"][0]
+        assert portfolio_data["position_count"] == 2
+        assert abs(portfolio_data["current_value"] - float(expected_value)) < 0.01
+        assert abs(data["total_net_worth"] - float(expected_value)) < 0.01
+
 
 class TestDashboardEdgeCases:
     """Test dashboard edge cases and error scenarios."""
@@ -298,6 +329,37 @@ class TestDashboardEdgeCases:
             )
 
 
+    @pytest.mark.asyncio
+    async def test_dashboard_served_from_response_cache(
+        self,
+        authenticated_user,
+        client: AsyncClient,
+        sample_portfolio: Portfolio,
+        enabled_response_cache,
+        monkeypatch
+    ):
+        """Test that a cached dashboard body is returned on the next request."""
+        from app.core.cache import response_cache
+        from app.portfolio.service import portfolio_service
+
+        headers = authenticated_user["headers"]
+
+        first = await client.get("/api/v1/dashboard/", headers=headers)
+        assert first.status_code == 200
+        assert list(enabled_response_cache.store) == [
+            response_cache.key("dashboard", authenticated_user["user"].id)
+        ]
+
+        async def not_recomputed(*args, **kwargs):
+            raise AssertionError("dashboard recomputed despite a cached body")
+
+        monkeypatch.setattr(portfolio_service, "get_summaries_for_user", not_recomputed)
+
+        second = await client.get("/api/v1/dashboard/", headers=headers)
+        assert second.status_code == 200
+        assert second.content == first.content
+
+
 class TestDashboardIntegration:
     """Integration tests for dashboard with other components."""
     
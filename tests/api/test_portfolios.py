@@ -0,0 +1,171 @@
+"""
+Portfolio API Tests
+
+Tests for portfolio listing and summary endpoints.
+"""
+import pytest
+from httpx import AsyncClient
+
+from app.db.models import Portfolio, Transaction
+from app.api.v1.schemas.portfolio import PositionResponse
+
+
+class TestListPortfolios:
+    """Test portfolio listing endpoint."""
+    
+    @pytest.mark.asyncio
+    async def test_list_requires_authentication(self, client: AsyncClient):
+        """Test listing portfolios without authentication."""
+        response = await client.get("/api/v1/portfolios/")
+        
+        assert response.status_code in [401, 403]
+    
+    @pytest.mark.asyncio
+    async def test_list_portfolios(
+        self,
+        authenticated_user,
+        client: AsyncClient,
+        sample_portfolio: Portfolio,
+        sample_transactions: list[Transaction]
+    ):
+        """Test that each portfolio is listed with its open position count."""
+        response = await client.get("/api/v1/portfolios/", headers=authenticated_user["headers"])
+        
+        assert response.status_code == 200
+        data = response.json()
+        
+        assert len(data) == 1
+        assert data[0]["id"] == sample_portfolio.id
+        assert data[0]["name"] == sample_portfolio.name
+        assert data[0]["position_count"] == 2
+        assert data[0]["last_updated"] is not None
+    
+    @pytest.mark.asyncio
+    async def test_list_portfolios_without_transactions(
+        self,
+        authenticated_user,
+        client: AsyncClient,
+        sample_portfolio: Portfolio
+    ):
+        """Test that an empty portfolio is listed with zeroed values."""
+        response = await client.get("/api/v1/portfolios/", headers=authenticated_user["headers"])
+        
+        assert response.status_code == 200
+        data = response.json()
+        
+        assert len(data) == 1
+        assert data[0]["position_count"] == 0
+        assert data[0]["total_value"] == 0.0
+
+
+class TestPortfolioPositions:
+    """Test portfolio positions endpoint."""
+    
+    @pytest.mark.asyncio
+    async def test_positions_response_shape(
+        self,
+        authenticated_user,
+        client: AsyncClient,
+        sample_portfolio: Portfolio,
+        sample_transactions: list[Transaction]
+    ):
+        """Test that every position carries the full PositionResponse field set."""
+        response = await client.get(
+            f"/api/v1/portfolios/{sample_portfolio.id}/positions",
+            headers=authenticated_user["headers"]
+        )
+        
+        assert response.status_code == 200
+        data = response.json()
+        
+        assert len(data) == 2
+        for position in data:
+            assert set(position) == set(PositionResponse.model_fields)
+            assert isinstance(position["quantity"], float)
+            assert position["currency"] == "INR"
+    
+    @pytest.mark.asyncio
+    async def test_positions_for_unknown_portfolio(self, authenticated_user, client: AsyncClient):
+        """Test positions for a portfolio the user does not own."""
+        response = await client.get(
+            "/api/v1/portfolios/missing-portfolio/positions",
+            headers=authenticated_user["headers"]
+        )
+        
+        assert response.status_code == 404
+
+
+class TestPortfolioSummary:
+    """Test portfolio summary endpoint."""
+    
+    @pytest.mark.asyncio
+    async def test_summary_for_owned_portfolio(
+        self,
+        authenticated_user,
+        client: AsyncClient,
+        sample_portfolio: Portfolio,
+        sample_transactions: list[Transaction]
+    ):
+        """Test that the summary carries the portfolio's own details."""
+        response = await client.get(
+            f"/api/v1/portfolios/{sample_portfolio.id}",
+            headers=authenticated_user["headers"]
+        )
+        
+        assert response.status_code == 200
+        data = response.json()
+        assert data["id"] == sample_portfolio.id
+        assert data["description"] == sample_portfolio.description
+        assert data["position_count"] == 2
+    
+    @pytest.mark.asyncio
+    async def test_summary_for_other_users_portfolio(
+        self,
+        authenticated_user,
+        client: AsyncClient,
+        db_session,
+        sample_portfolio: Portfolio
+    ):
+        """Test that another user's portfolio is reported as not found."""
+        sample_portfolio.user_id = "someone-else"
+        await db_session.commit()
+        
+        response = await client.get(
+            f"/api/v1/portfolios/{sample_portfolio.id}",
+            headers=authenticated_user["headers"]
+        )
+        
+        assert response.status_code == 404
+    
+    @pytest.mark.asyncio
+    async def test_summary_served_from_response_cache(
+        self,
+        authenticated_user,
+        client: AsyncClient,
+        sample_portfolio: Portfolio,
+        sample_transactions: list[Transaction],
+        enabled_response_cache,
+        monkeypatch
+    ):
+        """Test that a cached summary is reused and dropped on refresh."""
+        from app.portfolio.service import portfolio_service
+        
+        headers = authenticated_user["headers"]
+        url = f"/api/v1/portfolios/{sample_portfolio.id}"
+        
+        first = await client.get(url, headers=headers)
+        assert first.status_code == 200
+        assert len(enabled_response_cache.store) == 1
+        
+        async def not_recomputed(*args, **kwargs):
+            raise AssertionError("summary recomputed despite a cached body")
+        
+        monkeypatch.setattr(portfolio_service, "get_portfolio_summary", not_recomputed)
+        
+        second = await client.get(url, headers=headers)
+        assert second.status_code == 200
+        assert second.content == first.content
+        
+        refresh = await client.post(f"{url}/refresh", headers=headers)
+        assert refresh.status_code == 200
+        assert enabled_response_cache.store == {}
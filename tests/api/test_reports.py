@@ -0,0 +1,136 @@
+"""
+Reports API Tests
+
+Tests for the capital gains report and its CSV export.
+"""
+import pytest
+from httpx import AsyncClient
+from decimal import Decimal
+
+from app.db.models import Transaction, TransactionType
+
+
+def _financial_year_for(transaction: Transaction) -> str:
+    """Indian financial year (April to March) containing a transaction"""
+    txn_date = transaction.transaction_date
+    start_year = txn_date.year if txn_date.month >= 4 else txn_date.year - 1
+    return f"FY{start_year}-{str(start_year + 1)[-2:]}"
+
+
+class TestCapitalGainsReport:
+    """Test capital gains report endpoint."""
+    
+    @pytest.mark.asyncio
+    async def test_report_requires_authentication(self, client: AsyncClient):
+        """Test report without authentication."""
+        response = await client.get("/api/v1/reports/capital-gains", params={"financial_year": "FY2024-25"})
+        
+        assert response.status_code in [401, 403]
+    
+    @pytest.mark.asyncio
+    async def test_report_matches_sales_to_purchase_lots(
+        self,
+        authenticated_user,
+        client: AsyncClient,
+        sample_transactions: list[Transaction]
+    ):
+        """Test that a partial sale is reported against its FIFO purchase lot."""
+        buy_txn, sell_txn = sample_transactions[0], sample_transactions[1]
+        assert sell_txn.transaction_type == TransactionType.SELL
+        
+        response = await client.get(
+            "/api/v1/reports/capital-gains",
+            params={"financial_year": _financial_year_for(sell_txn)},
+            headers=authenticated_user["headers"]
+        )
+        
+        assert response.status_code == 200
+        data = response.json()
+        
+        assert data["total_transactions"] == 1
+        item = data["gains_items"][0]
+        
+        expected_buy_value = buy_txn.net_amount / buy_txn.quantity * sell_txn.quantity
+        expected_gain = sell_txn.quantity * sell_txn.price - expected_buy_value
+        
+        assert Decimal(item["quantity"]) == sell_txn.quantity
+        assert Decimal(item["buy_value"]) == pytest.approx(expected_buy_value)
+        assert Decimal(item["capital_gain"]) == pytest.approx(expected_gain)
+        assert item["is_long_term"] is False
+        assert item["tax_lot_details"]["buy_transaction_id"] == buy_txn.id
+        assert item["tax_lot_details"]["sell_transaction_id"] == sell_txn.id
+        assert item["tax_lot_details"]["tax_lot_id"] == f"{buy_txn.id}:{sell_txn.id}"
+        assert Decimal(data["total_short_term_gains"]) == pytest.approx(expected_gain)
+    
+    @pytest.mark.asyncio
+    async def test_report_for_year_without_sales(
+        self,
+        authenticated_user,
+        client: AsyncClient,
+        sample_transactions: list[Transaction]
+    ):
+        """Test that a financial year with no sales produces an empty report."""
+        response = await client.get(
+            "/api/v1/reports/capital-gains",
+            params={"financial_year": "FY2001-02"},
+            headers=authenticated_user["headers"]
+        )
+        
+        assert response.status_code == 200
+        data = response.json()
+        assert data["total_transactions"] == 0
+        assert data["gains_items"] == []
+
+
+class TestCapitalGainsSummary:
+    """Test capital gains totals endpoint."""
+    
+    @pytest.mark.asyncio
+    async def test_summary_matches_report_totals(
+        self,
+        authenticated_user,
+        client: AsyncClient,
+        sample_transactions: list[Transaction]
+    ):
+        """Test that the summary carries the same totals as the full report."""
+        params = {"financial_year": _financial_year_for(sample_transactions[1])}
+        headers = authenticated_user["headers"]
+        
+        report = await client.get("/api/v1/reports/capital-gains", params=params, headers=headers)
+        summary = await client.get("/api/v1/reports/capital-gains/summary", params=params, headers=headers)
+        
+        assert summary.status_code == 200
+        data = summary.json()
+        assert "gains_items" not in data
+        for field in ("total_transactions", "total_short_term_gains", "total_long_term_gains", "net_capital_gains"):
+            assert data[field] == report.json()[field]
+
+
+class TestCapitalGainsExport:
+    """Test capital gains CSV export endpoint."""
+    
+    @pytest.mark.asyncio
+    async def test_export_csv(
+        self,
+        authenticated_user,
+        client: AsyncClient,
+        sample_transactions: list[Transaction]
+    ):
+        """Test that the export contains a header, one row per lot and the summary."""
+        sell_txn = sample_transactions[1]
+        
+        response = await client.get(
+            "/api/v1/reports/capital-gains/export",
+            params={"financial_year": _financial_year_for(sell_txn)},
+            headers=authenticated_user["headers"]
+        )
+        
+        assert response.status_code == 200
+        assert response.headers["content-type"].startswith("text/csv")
+        assert "attachment; filename=capital_gains_" in response.headers["content-disposition"]
+        
+        lines = response.text.splitlines()
+        assert lines[0].startswith("Instrument Name,ISIN,Quantity")
+        assert lines[1].endswith("Short Term")
+        assert lines[3] == "SUMMARY"
+        assert lines[-1].startswith("Net Capital Gains")
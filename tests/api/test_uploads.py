@@ -424,7 +424,23 @@ class TestUploadErrorHandling:
         # Should handle large files (may take longer but should succeed)
         # Note: In production, we might want file size limits
         assert response.status_code in [200, 413, 500]  # 413 = Payload Too Large
-    
+
+    @pytest.mark.asyncio
+    async def test_upload_over_size_limit(self, authenticated_user, sample_portfolio, client: AsyncClient, monkeypatch):
+        """Test that files past MAX_FILE_SIZE_MB are rejected with 413."""
+        from app.core.config import settings
+
+        monkeypatch.setattr(settings, "MAX_FILE_SIZE_MB", 0)
+
+        response = await client.post(
+            "/api/v1/uploads/",
+            params={"portfolio_id": str(sample_portfolio.id)},
+            headers=authenticated_user["headers"],
+            files={"files": ("statement.csv", BytesIO(b"Date,Symbol\n"), "text/csv")}
+        )
+
+        assert response.status_code == 413
+
     @pytest.mark.asyncio
     async def test_upload_unsupported_file_type(self, authenticated_user, sample_portfolio, client: AsyncClient):
         """Test upload with completely unsupported file type."""
@@ -521,6 +537,37 @@ class TestUploadIntegration:
         # - Average cost is calculated correctly
         # - Portfolio value is updated
 
+    @pytest.mark.asyncio
+    async def test_upload_invalidates_cached_dashboard(
+        self, authenticated_user, sample_portfolio, client: AsyncClient, enabled_response_cache
+    ):
+        """Test that an upload evicts the user's cached dashboard and portfolio responses."""
+        from app.core.cache import response_cache
+
+        headers = authenticated_user["headers"]
+        user_id = authenticated_user["user"].id
+        dashboard_key = response_cache.key("dashboard", user_id)
+        summary_key = response_cache.key("portfolios", user_id, sample_portfolio.id, "summary", None)
+        enabled_response_cache.store[summary_key] = b"{}"
+
+        response = await client.get("/api/v1/dashboard/", headers=headers)
+        assert response.status_code == 200
+        assert dashboard_key in enabled_response_cache.store
+
+        csv_content = """Date,Symbol,Company Name,Transaction Type,Quantity,Price,Total Amount
+2024-01-15,AAPL,Apple Inc,BUY,10,150.25,1502.50"""
+
+        response = await client.post(
+            "/api/v1/uploads/",
+            params={"portfolio_id": str(sample_portfolio.id)},
+            headers=headers,
+            files={"files": ("vested_transactions.csv", BytesIO(csv_content.encode("utf-8")), "text/csv")}
+        )
+        assert response.status_code == 200
+
+        assert dashboard_key not in enabled_response_cache.store
+        assert summary_key not in enabled_response_cache.store
+
 
 class TestTransactionParsingAccuracy:
     """Test accuracy of transaction parsing - critical for math validation."""
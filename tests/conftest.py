@@ -10,6 +10,7 @@ from datetime import datetime, date, timedelta
 from decimal import Decimal
 from typing import AsyncGenerator, Generator, Dict, Any
 from unittest.mock import AsyncMock
+from fnmatch import fnmatchcase
 import httpx
 from httpx import AsyncClient
 from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
@@ -25,7 +26,9 @@ if os.path.exists(".env.test"):
 os.environ["DATABASE_URL"] = "sqlite+aiosqlite:///:memory:"
 
 from app.main import create_application
-from app.core.database import Base, get_db
+from app.core.database import Base, get_db, install_updated_at_triggers
+from app.api.dependencies import _TOKEN_CACHE, _USER_CACHE
+from app.core.cache import response_cache
 from app.db.models import (
     User, Portfolio, Instrument, Transaction, Price,
     AssetClass, Currency, Exchange, TransactionType
@@ -56,6 +59,7 @@ async def test_engine():
     # Create all tables
     async with engine.begin() as conn:
         await conn.run_sync(Base.metadata.create_all)
+        await conn.run_sync(install_updated_at_triggers)
     
     yield engine
     
@@ -86,8 +90,10 @@ async def client(db_session) -> AsyncGenerator[AsyncClient, None]:
     async with AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://testserver") as test_client:
         yield test_client
     
-    # Clean up overrides
+    # Clean up overrides and per-process auth caches
     app.dependency_overrides.clear()
+    _TOKEN_CACHE.clear()
+    _USER_CACHE.clear()
 
 
 # ============================================================================
@@ -141,6 +147,40 @@ def mock_fx_service():
 # Data Generator Fixtures
 # ============================================================================
 
+class InMemoryRedis:
+    """Minimal async stand-in for the Redis calls ResponseCache makes"""
+
+    def __init__(self):
+        self.store: Dict[str, bytes] = {}
+
+    async def get(self, key):
+        return self.store.get(key)
+
+    async def set(self, key, value, ex=None):
+        self.store[key] = value
+
+    async def scan_iter(self, match="*", count=None):
+        for key in list(self.store):
+            if fnmatchcase(key, match):
+                yield key
+
+    async def delete(self, *keys):
+        return sum(self.store.pop(key, None) is not None for key in keys)
+
+    async def aclose(self):
+        pass
+
+
+@pytest.fixture
+def enabled_response_cache(monkeypatch) -> InMemoryRedis:
+    """Enable the response cache against an in-memory Redis stand-in"""
+    redis = InMemoryRedis()
+    monkeypatch.setattr(response_cache, "enabled", True)
+    monkeypatch.setattr(response_cache, "_disabled_until", 0.0)
+    monkeypatch.setattr(response_cache, "_client", redis)
+    return redis
+
+
 @pytest.fixture
 def user_data_generator():
     """Generate synthetic user data."""
@@ -57,4 +57,95 @@ async def test_sample_data_creation(sample_user, sample_portfolio, sample_instru
     # Check instruments
     assert len(sample_instruments) == 4
     assert any(inst.symbol == "RELIANCE" for inst in sample_instruments)
-    assert any(inst.symbol == "AAPL" for inst in sample_instruments)
\ No newline at end of file
+    assert any(inst.symbol == "AAPL" for inst in sample_instruments)
+
+
+@pytest.mark.asyncio
+async def test_security_headers(client):
+    """Test that security headers are added to responses."""
+    response = await client.get("/health")
+    assert response.headers["x-content-type-options"] == "nosniff"
+    assert response.headers["x-frame-options"] == "DENY"
+    assert response.headers["strict-transport-security"] == "max-age=31536000; includeSubDomains"
+    assert response.headers["referrer-policy"] == "strict-origin-when-cross-origin"
+
+
+@pytest.mark.asyncio
+async def test_request_id_header(client):
+    """Test that each response carries a distinct request ID."""
+    first = await client.get("/api/v1/portfolios/")
+    second = await client.get("/api/v1/portfolios/")
+    assert first.headers["x-request-id"]
+    assert first.headers["x-request-id"] != second.headers["x-request-id"]
+
+
+@pytest.mark.asyncio
+async def test_health_check_not_audited(client):
+    """Test that health probes skip the audit log but keep security headers."""
+    response = await client.get("/health")
+    assert "x-request-id" not in response.headers
+    assert response.headers["x-frame-options"] == "DENY"
+
+
+@pytest.mark.unit
+def test_primary_keys_are_time_ordered():
+    """Test that generated primary keys are UUIDv7 and sort by creation time."""
+    import time
+    import uuid
+    from app.core.database import uuid7
+
+    first = uuid7()
+    time.sleep(0.002)
+    second = uuid7()
+    assert uuid.UUID(first).version == 7
+    assert first < second
+
+
+@pytest.mark.unit
+def test_log_writer_reports_dropped_lines():
+    """Test that lines dropped on a full log queue are reported on the next write."""
+    import io
+    import threading
+    from app.core.logging import QueuedLogWriter
+
+    writing = threading.Event()
+    release = threading.Event()
+
+    class BlockingFile(io.BytesIO):
+        def write(self, data):
+            writing.set()
+            release.wait(timeout=5)
+            return super().write(data)
+
+    output = BlockingFile()
+    writer = QueuedLogWriter(output, maxsize=1)
+    writer.put(b"first\n")
+    assert writing.wait(timeout=5)
+
+    for _ in range(4):
+        writer.put(b"overflow\n")
+    release.set()
+    writer.close()
+
+    lines = output.getvalue().splitlines()
+    assert lines[:2] == [b"first", b"overflow"]
+    assert b'"dropped":3' in lines[2]
+
+
+@pytest.mark.asyncio
+async def test_updated_at_moves_on_update(db_session):
+    """Test that the updated_at trigger re-stamps a row when it is updated."""
+    old = "2000-01-01 00:00:00.000000"
+    await db_session.execute(
+        text(
+            "INSERT INTO users (id, email, hashed_password, full_name, is_active, is_verified, created_at, updated_at) "
+            "VALUES ('stale-user', 'stale@example.com', 'x', 'Stale User', 1, 0, :old, :old)"
+        ),
+        {"old": old},
+    )
+    await db_session.execute(text("UPDATE users SET full_name = 'Fresh User' WHERE id = 'stale-user'"))
+
+    updated_at = await db_session.scalar(text("SELECT updated_at FROM users WHERE id = 'stale-user'"))
+    await db_session.rollback()
+
+    assert updated_at > old
@@ -0,0 +1,41 @@
+"""
+Instrument mapping service tests.
+
+Cover the per-worker resolution cache in find_or_create_instrument, which must
+never short-circuit to a different instrument than full resolution would pick.
+"""
+import pytest
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.canonicalization.canonicalizer import IdentifierType, InstrumentIdentifier
+from app.canonicalization.service import InstrumentMappingService
+from app.db.models import AssetClass, Currency
+
+
+@pytest.mark.asyncio
+async def test_uncached_isin_not_resolved_through_cached_symbol(db_session: AsyncSession):
+    """Test that a cached symbol hit doesn't capture a row whose ISIN belongs elsewhere."""
+    service = InstrumentMappingService()
+
+    by_symbol = await service.find_or_create_instrument(
+        db_session, "Alpha Industries", {"isin": "INE000A01011", "symbol": "ALPHA"},
+        AssetClass.EQUITY, Currency.INR, "NSE"
+    )
+    by_isin = await service.find_or_create_instrument(
+        db_session, "Beta Industries", {"isin": "INE000B01019"},
+        AssetClass.EQUITY, Currency.INR, "NSE"
+    )
+    await db_session.commit()
+
+    # Another worker resolved the ISIN, or the entry expired: only the symbol is cached
+    service._resolved_ids.pop(service._identifier_key(
+        InstrumentIdentifier(IdentifierType.ISIN, "INE000B01019")
+    ))
+
+    resolved = await service.find_or_create_instrument(
+        db_session, "Beta Industries", {"isin": "INE000B01019", "symbol": "ALPHA"},
+        AssetClass.EQUITY, Currency.INR, "NSE"
+    )
+
+    assert resolved.id == by_isin.id
+    assert by_symbol.isin == "INE000A01011"
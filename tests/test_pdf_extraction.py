@@ -0,0 +1,96 @@
+"""
+PDF text extraction parity tests.
+
+The CAS and ICICI Direct parsers match line-oriented regexes against the
+extracted text, so every supported extraction backend must produce text
+they parse identically.
+"""
+import pytest
+from decimal import Decimal
+
+from app.core.config import settings
+from app.ingestion import pdf
+from app.ingestion.cas_parser import CASParser
+from app.ingestion.icici_direct import ICICIDirectParser
+
+
+CAS_LINES = [
+    "CONSOLIDATED ACCOUNT STATEMENT",
+    "CAMS",
+    "Statement Period: 01/01/2023 to 31/12/2023",
+    "PAN: ABCDE1234F",
+    "Folio No: 12345/67",
+    "Scheme: HDFC Top 100 Fund - Growth Advisor: DIRECT",
+    "ISIN: INF179K01BE2 AMFI: 101762",
+    "15/02/2023 Purchase 10,000.00 12.345 810.05 12.345",
+    "15/03/2023 SIP Purchase 5,000.00 6.000 833.33 18.345",
+    "Closing Unit Balance: 18.345 NAV on 31/12/2023: 900.10 Value on 31/12/2023: 16,512.33",
+    "Folio No: 999",
+    "Scheme: Axis Bluechip Fund",
+    "AMFI: 120465",
+    "10/06/2023 Redemption -2,000.00 -40.000 50.00 60.000",
+]
+
+ICICI_LINES = [
+    "ICICI Securities Ltd",
+    "CONTRACT NOTE",
+    "Trade Date: 15/02/2023",
+    "Settlement Date: 17/02/2023",
+    "Client Code: AB1234",
+    "BUY RELIANCE 10 2,500.50 25,005.00 25.00 25,030.00 ",
+    "SELL INFY 5 1,500.00 7,500.00 7.50 7,492.50 ",
+    "RELIANCE INE002A01018",
+    "INFY INE009A01021",
+]
+
+
+def _build_pdf(lines):
+    """Single-page PDF with one text line per entry"""
+    if pdf.pymupdf is None:
+        pytest.skip("PyMuPDF is not installed")
+
+    document = pdf.pymupdf.open()
+    page = document.new_page()
+    for row, line in enumerate(lines):
+        page.insert_text((40, 50 + row * 14), line, fontsize=9)
+    content = document.tobytes()
+    document.close()
+    return content
+
+
+def _parse_with(backend, monkeypatch, parser, content):
+    monkeypatch.setattr(settings, "PDF_TEXT_BACKEND", backend)
+    pdf._text_cache.clear()
+    transactions = parser.parse_transactions(content, "statement.pdf")
+    holdings = parser.parse_holdings(content, "statement.pdf") if isinstance(parser, CASParser) else []
+    pdf._text_cache.clear()
+    return transactions, holdings
+
+
+@pytest.mark.unit
+def test_cas_parses_identically_with_each_backend(monkeypatch):
+    content = _build_pdf(CAS_LINES)
+    parser = CASParser()
+
+    pypdf2_result = _parse_with("pypdf2", monkeypatch, parser, content)
+    pymupdf_result = _parse_with("pymupdf", monkeypatch, parser, content)
+
+    transactions, holdings = pymupdf_result
+    assert pymupdf_result == pypdf2_result
+    assert [txn.amfi_code for txn in transactions] == ["101762", "101762", "120465"]
+    assert transactions[0].instrument_name == "HDFC Top 100 Fund - Growth"
+    assert holdings[0].market_value == Decimal("16512.33")
+
+
+@pytest.mark.unit
+def test_icici_parses_identically_with_each_backend(monkeypatch):
+    content = _build_pdf(ICICI_LINES)
+    parser = ICICIDirectParser()
+
+    pypdf2_result = _parse_with("pypdf2", monkeypatch, parser, content)
+    pymupdf_result = _parse_with("pymupdf", monkeypatch, parser, content)
+
+    transactions, _ = pymupdf_result
+    assert pymupdf_result == pypdf2_result
+    assert [txn.quantity for txn in transactions] == [Decimal("10"), Decimal("5")]
+    assert transactions[0].price == Decimal("2500.50")